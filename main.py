@@ -1,9 +1,10 @@
 import argparse
 import logging
+import importlib
 import signal
 import sys
 import os
-from typing import Optional, Awaitable
+from typing import Optional, Awaitable, Callable
 import asyncio # NEU: Für asynchrone Logik
 from dotenv import load_dotenv
 
@@ -40,14 +41,13 @@ async def message_callback(message: DecodedMessage):
     """Callback-Funktion, die aufgerufen wird, wenn eine Nachricht dekodiert wurde."""
     model = message.metadata.get("model", "Unknown")
     logger.info(
-        f"Decoded message received: protocol={message.protocol_id}, "
-        f"model={model}, "
-        f"payload={message.payload}"
+        "Decoded message received: protocol=%s, model=%s, payload=%s",
+        message.protocol_id, model, message.payload,
     )
-    logger.debug(f"Full Metadata: {message.metadata}")
+    logger.debug("Full Metadata: %s", message.metadata)
     # NEU: Überprüfe, ob RawFrame vorhanden ist und das Attribut 'line' hat
     if message.raw and isinstance(message.raw, RawFrame):
-        logger.debug(f"Raw Frame: {message.raw.line}")
+        logger.debug("Raw Frame: %s", message.raw.line)
 
 
 # NEU: Die asynchrone Hauptlogik, die von asyncio.run() aufgerufen wird
@@ -127,6 +127,24 @@ async def _async_run(args: argparse.Namespace):
         sys.exit(1)
 
 
+def _event_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Liefert uvloop bzw. unter Windows winloop als Event-Loop, falls installiert (Extra ``signalduino-mqtt[fast]``)."""
+    for module_name in ("uvloop", "winloop"):
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        return module.new_event_loop
+    return None
+
+
+def _install_eager_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+    """Ab Python 3.12 starten neue Tasks sofort bis zum ersten await, statt erst im nächsten Loop-Durchlauf."""
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+
+
 # Die synchrone Hauptfunktion
 def main():
     # .env-Datei laden. Umgebungsvariablen werden gesetzt, aber CLI-Argumente überschreiben diese.
@@ -196,7 +214,9 @@ def main():
     
     # Starte die asynchrone Hauptlogik
     try:
-        asyncio.run(_async_run(args))
+        with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+            _install_eager_task_factory(runner.get_loop())
+            runner.run(_async_run(args))
     except KeyboardInterrupt:
         # Fängt den KeyboardInterrupt ab, der nach loop.stop() auftreten kann
         logger.info("Programm beendet durch KeyboardInterrupt.")
@@ -1,12 +1,14 @@
 from __future__ import annotations
 import json
 import logging
+import math
 import re
 from typing import (
-    Callable, Any, Dict, List, Awaitable, Optional, Pattern, TYPE_CHECKING
+    Callable, Any, Dict, List, Awaitable, Optional, Pattern, Union, TYPE_CHECKING
 )
 
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError, validators
+from jsonschema.exceptions import best_match
 from signalduino.exceptions import CommandValidationError, SignalduinoCommandTimeout
 from .constants import SDUINO_CMD_TIMEOUT
 
@@ -31,6 +33,40 @@ CC1101_REGISTER_MAP: Dict[str, int] = {
     "PARTNUM": 0x30, "VERSION": 0x31, "MARCSTATE": 0x35, "LQI": 0x38, "RSSI": 0x39
 }
 
+# CC1101 Quarzfrequenz (FXOSC) und die daraus abgeleitete Schrittweite der Datenrate
+# (FXOSC / 2^28 ist exakt darstellbar, die Ergebnisse bleiben bitgleich zur Originalformel).
+_CC1101_FXOSC_HZ = 26000000.0
+_CC1101_DRATE_STEP_HZ = _CC1101_FXOSC_HZ / (1 << 28)
+# Frequenzregister FREQ2..FREQ0: f_carrier = FXOSC / 2^16 * FREQ
+_CC1101_FREQ_STEP_MHZ = _CC1101_FXOSC_HZ / 1e6 / (1 << 16)
+# Umkehrung für set_frequency: FREQ = f_carrier * 2^16 / FXOSC (wie setFreq in 00_SIGNALduino.pm)
+_CC1101_FREQ_SCALE = (1 << 16) / (_CC1101_FXOSC_HZ / 1e6)
+# Verstärkung (AGCCTRL2[2:0]) in dB je Registerindex, basierend auf Perl setrAmpl
+_CC1101_RAMPL_DB: tuple[int, ...] = (24, 27, 30, 33, 36, 38, 40, 42)
+_CC1101_RAMPL_INDEX: Dict[int, int] = {db: index for index, db in enumerate(_CC1101_RAMPL_DB)}
+# Schrittweite der Frequenzabweichung (DEVIATN): f_dev = FXOSC / 2^17 * (8 + DEVIATION_M) * 2^DEVIATION_E
+_CC1101_DEVIATN_STEP_KHZ = _CC1101_FXOSC_HZ / 1000.0 / (1 << 17)
+
+# Rx-Filterbandbreite (kHz) für alle 16 Kombinationen aus CHANBW_E (MDMCFG4[7:6]) und
+# CHANBW_M (MDMCFG4[5:4]), indiziert über MDMCFG4 >> 4:
+# Bw = FXOSC / (8 * (4 + CHANBW_M) * 2^CHANBW_E)
+_CC1101_BANDWIDTH_KHZ: tuple[float, ...] = tuple(
+    round(_CC1101_FXOSC_HZ / 1000.0 / (8.0 * (4.0 + (idx & 3)) * (1 << (idx >> 2))), 3)
+    for idx in range(16)
+)
+
+# Antwortmuster werden einmalig beim Import kompiliert und bei jedem Kommando wiederverwendet.
+_RX_NUMERIC_RESPONSE = re.compile(r'^(\d+)$')
+_RX_DECODER_CONFIG = re.compile(r'^\s*([A-Za-z0-9]+=\d+;?)+\s*$', re.IGNORECASE)
+# Response-Patterns aus 00_SIGNALduino.pm, Zeilen 86-88
+_RX_CCCONF_RESPONSE = re.compile(r'^\s*C0D\w*\s*=\s*.*$', re.IGNORECASE)
+_RX_CCREG_RESPONSE = re.compile(r'^\s*(C[a-f0-9]{2}\s*=\s*[a-f0-9]+|ccreg [a-f0-9]{2}:.*)\s*$', re.IGNORECASE)
+_RX_CCPATABLE_RESPONSE = re.compile(r'^\s*C3E\s*=\s*.*\s*$', re.IGNORECASE)
+# Wert aus einer Registerantwort 'Cxx = <hex>' am Zeilenende (Frequenzregister)
+_RX_CCREG_VALUE_EOL = re.compile(r'C[A-Fa-f0-9]{2}\s*=\s*([0-9A-Fa-f]+)\s*$')
+# Wert aus einer Registerantwort 'Cxx = <hex>' (MDMCFG4 & Co. in _read_register_value)
+_RX_CCREG_VALUE = re.compile(r'C[A-Fa-f0-9]{2}\s*=\s*([0-9A-Fa-f]+)\s*', re.IGNORECASE)
+
 # --- BEREICH 1: SignalduinoCommands (Implementierung der seriellen Befehle) ---
 
 class SignalduinoCommands:
@@ -62,10 +98,9 @@ class SignalduinoCommands:
     async def get_free_ram(self, timeout: float = SDUINO_CMD_TIMEOUT) -> int:
         """Free RAM (R)"""
         # Firmware typically responds with a numeric value (e.g., "1234")
-        response_pattern = re.compile(r'^(\d+)$')
-        response = await self._send_command(command="R", expect_response=True, timeout=timeout, response_pattern=response_pattern)
+        response = await self._send_command(command="R", expect_response=True, timeout=timeout, response_pattern=_RX_NUMERIC_RESPONSE)
         
-        match = response_pattern.match(response.strip())
+        match = _RX_NUMERIC_RESPONSE.match(response.strip())
         if match:
             return int(match.group(1))
         raise ValueError(f"Unexpected response format for Free RAM: {response}")
@@ -73,10 +108,9 @@ class SignalduinoCommands:
     async def get_uptime(self, timeout: float = SDUINO_CMD_TIMEOUT) -> int:
         """System uptime (t)"""
         # Firmware typically responds with a numeric value (e.g., "1234")
-        response_pattern = re.compile(r'^(\d+)$')
-        response = await self._send_command(command="t", expect_response=True, timeout=timeout, response_pattern=response_pattern)
+        response = await self._send_command(command="t", expect_response=True, timeout=timeout, response_pattern=_RX_NUMERIC_RESPONSE)
         
-        match = response_pattern.match(response.strip())
+        match = _RX_NUMERIC_RESPONSE.match(response.strip())
         if match:
             return int(match.group(1))
         raise ValueError(f"Unexpected response format for Uptime: {response}")
@@ -91,26 +125,23 @@ class SignalduinoCommands:
         
     async def get_config(self, timeout: float = SDUINO_CMD_TIMEOUT) -> Dict[str, int]:
         """Decoder configuration (CG) - Returns parsed dictionary."""
-        config_pattern = re.compile(r'^\s*([A-Za-z0-9]+=\d+;?)+\s*$', re.IGNORECASE)
         response = await self._send_command(
             command="CG",
             expect_response=True,
             timeout=timeout,
-            response_pattern=config_pattern
+            response_pattern=_RX_DECODER_CONFIG
         )
         return self._parse_decoder_config(response)
         
     async def get_ccconf(self, timeout: float = SDUINO_CMD_TIMEOUT) -> Dict[str, str]:
         """CC1101 configuration registers (C0DnF). Returns a dictionary with the raw string."""
-        # Response-Pattern aus 00_SIGNALduino.pm, Zeile 86, angepasst an Python regex
-        response = await self._send_command(command="C0DnF", expect_response=True, timeout=timeout, response_pattern=re.compile(r'^\s*C0D\w*\s*=\s*.*$', re.IGNORECASE))
+        response = await self._send_command(command="C0DnF", expect_response=True, timeout=timeout, response_pattern=_RX_CCCONF_RESPONSE)
         # Kapselt den rohen String, um die MQTT-Antwort konsistent als Dict zurückzugeben
         return {"cc1101_config_string": response}
         
     async def get_ccpatable(self, timeout: float = SDUINO_CMD_TIMEOUT) -> Dict[str, str]:
         """CC1101 PA table (C3E)"""
-        # Response-Pattern aus 00_SIGNALduino.pm, Zeile 88
-        response = await self._send_command(command="C3E", expect_response=True, timeout=timeout, response_pattern=re.compile(r'^\s*C3E\s*=\s*.*\s*$', re.IGNORECASE))
+        response = await self._send_command(command="C3E", expect_response=True, timeout=timeout, response_pattern=_RX_CCPATABLE_RESPONSE)
         return {"pa_table_hex": response}
         
     async def factory_reset(self, timeout: float = SDUINO_CMD_TIMEOUT) -> Dict[str, str]:
@@ -152,7 +183,7 @@ class SignalduinoCommands:
         
         # Stellt sicher, dass wir nur den Wert nach 'C[A-Fa-f0-9]{2}\s*=\s*([0-9A-Fa-f]+)' extrahieren
         # Hinzufügen von \s* um die Werte herum, um Whitespace-Toleranz zu erhöhen.
-        match = re.search(r'C[A-Fa-f0-9]{2}\s*=\s*([0-9A-Fa-f]+)\s*', response, re.IGNORECASE)
+        match = _RX_CCREG_VALUE.search(response)
         if match:
             return int(match.group(1), 16)
         # Fängt auch den Fall 'ccreg 00:' (default-Antwort) oder andere unerwartete Antworten ab
@@ -162,34 +193,16 @@ class SignalduinoCommands:
         """Liest die CC1101 Bandbreitenregister (MDMCFG4/0x10) und berechnet die Bandbreite in kHz."""
         r10 = await self._read_register_value(0x10) # MDMCFG4
         
-        # Bw (kHz) = 26000 / (8 * (4 + ((r10 >> 4) & 3)) * (1 << ((r10 >> 6) & 3)))
-        mant_b = (r10 >> 4) & 3
-        exp_b = (r10 >> 6) & 3
-        
-        # Frequenz (FXOSC) ist 26 MHz (26000 kHz)
-        bandwidth_khz = 26000.0 / (8.0 * (4.0 + mant_b) * (1 << exp_b))
-        
-        return {"bandwidth": round(bandwidth_khz, 3)}
+        # Bits 7:4 (CHANBW_E, CHANBW_M) wählen den vorberechneten Tabellenwert
+        return {"bandwidth": _CC1101_BANDWIDTH_KHZ[(r10 >> 4) & 0x0F]}
 
     async def get_rampl(self, payload: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
         """Liest die CC1101 Verstärkungsregister (AGCCTRL0/0x1B) und gibt die Verstärkung in dB zurück."""
         r1b = await self._read_register_value(0x1B) # AGCCTRL0
 
         # Annahme der CC1101-Werte basierend auf FHEM Code:
-        # Dies sind die AGC_LNA_GAIN-Einstellungen. Wir nehmen die im Code verfügbare Liste.
-        ampllist = [24, 27, 30, 33, 36, 38, 40, 42] 
-        
-        # Index ist die unteren 3 Bits von 0x1B: r1b & 7
-        index = r1b & 7
-        
-        if index < len(ampllist):
-            rampl_db = ampllist[index]
-        else:
-            # Dies sollte nicht passieren, wenn die CC1101-Registerwerte korrekt sind
-            logger.warning("Invalid AGC_LNA_GAIN setting found in 0x1B: %s", index)
-            rampl_db = -1 # Fehlerwert
-            
-        return {"rampl": rampl_db}
+        # Index sind die unteren 3 Bits von 0x1B (r1b & 7), die Tabelle deckt alle 8 Werte ab.
+        return {"rampl": _CC1101_RAMPL_DB[r1b & 7]}
 
     async def get_sensitivity(self, payload: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
         """Liest die CC1101 Empfindlichkeitsregister (RSSIAGC/0x1D) und gibt die Empfindlichkeit in dB zurück."""
@@ -212,12 +225,8 @@ class SignalduinoCommands:
         drate_m = r11
         drate_e = r10 & 15
 
-        # FXOSC = 26 MHz = 26000000 Hz
-        FXOSC = 26000000.0
-        DIVIDER = 2**28
-        
-        # Berechnung in Hz
-        data_rate_hz = ((256.0 + drate_m) * (2**drate_e) * FXOSC) / DIVIDER
+        # Berechnung in Hz (FXOSC = 26 MHz)
+        data_rate_hz = (256.0 + drate_m) * (1 << drate_e) * _CC1101_DRATE_STEP_HZ
         
         # Umrechnung in kBaud (kiloBaud = kiloBits pro Sekunde)
         data_rate_kbaud = data_rate_hz / 1000.0
@@ -238,55 +247,73 @@ class SignalduinoCommands:
         FXOSC = 26 MHz
         """
         
-        FXOSC = 26000000.0
         target_datarate_hz = datarate_kbaud * 1000.0
         
         # Berechne den Wert T, der auf der rechten Seite der umgestellten Formel steht
-        T = (target_datarate_hz * (2**28)) / FXOSC
+        T = target_datarate_hz / _CC1101_DRATE_STEP_HZ
         
-        # DRATE_E (Exponent) kann von 0 bis 15 gehen. Wir suchen die beste Kombination.
+        # Außerhalb von (256 + 0) * 2^0 .. (256 + 255) * 2^15 ist keine Datenrate einstellbar.
+        if not (256.0 <= T <= 511.0 * (1 << 15)):
+            logger.error("Could not find suitable DRATE_E/DRATE_M for datarate %.2f kBaud. Defaulting to 0.", datarate_kbaud)
+            return 0, 0
+
+        # Geschlossene Form: 256 + DRATE_M liegt in [256, 511], also ist DRATE_E = floor(log2(T / 256)).
+        # Wegen Rundung von DRATE_M (und Gleitkomma-Ungenauigkeit von log2) werden die
+        # Nachbarexponenten E-1 und E+1 mitgeprüft.
+        drate_e_guess = int(math.floor(math.log2(T / 256.0)))
+
         best_drate_e = 0
         best_drate_m = 0
         min_error = float('inf')
-        
-        for drate_e in range(16):
-            # Versuche, DRATE_M zu isolieren:
-            # 256 + DRATE_M = T / 2^DRATE_E
-            
-            # Da T / 2^DRATE_E ein Float ist, rechnen wir mit dem Zähler weiter, um Fehler zu minimieren
-            term = T / (2**drate_e)
-            
-            # DRATE_M = term - 256
-            drate_m_float = term - 256.0
-            
-            # DRATE_M muss zwischen 0 und 255 liegen.
-            if 0 <= drate_m_float <= 255:
-                # Wähle den nächsten ganzen Wert für DRATE_M
-                drate_m_candidate = int(round(drate_m_float))
-                
-                # Berechne die tatsächliche Datenrate mit den Kandidaten-Registern
-                actual_datarate_hz = ((256.0 + drate_m_candidate) * (2**drate_e) * FXOSC) / (2**28)
-                
-                # Berechne den Fehler (Absolutwert)
-                error = abs(target_datarate_hz - actual_datarate_hz)
-                
-                if error < min_error:
-                    min_error = error
-                    best_drate_e = drate_e
-                    best_drate_m = drate_m_candidate
-                    
-        if min_error == float('inf'):
-            logger.error("Could not find suitable DRATE_E/DRATE_M for datarate %.2f kBaud. Defaulting to 0.", datarate_kbaud)
-            return 0, 0
-            
+
+        for drate_e in (drate_e_guess - 1, drate_e_guess, drate_e_guess + 1):
+            if not 0 <= drate_e <= 15:
+                continue
+            drate_m_candidate = min(255, max(0, int(round(T / (1 << drate_e) - 256.0))))
+            actual_datarate_hz = (256.0 + drate_m_candidate) * (1 << drate_e) * _CC1101_DRATE_STEP_HZ
+            error = abs(target_datarate_hz - actual_datarate_hz)
+            if error < min_error:
+                min_error = error
+                best_drate_e = drate_e
+                best_drate_m = drate_m_candidate
+
         return best_drate_e, best_drate_m
 
+    def _calculate_deviation_register(self, deviation_khz: float) -> int:
+        """
+        Berechnet den DEVIATN-Registerwert (0x15) für die gewünschte Frequenzabweichung in kHz.
+
+        f_dev = f_xosc / 2^17 * (8 + DEVIATION_M) * 2^DEVIATION_E
+        mit DEVIATION_M (Bits 2:0) und DEVIATION_E (Bits 6:4) jeweils 0..7.
+        """
+        T = deviation_khz / _CC1101_DEVIATN_STEP_KHZ
+
+        # Geschlossene Form wie bei der Datenrate: 8 + DEVIATION_M liegt in [8, 15],
+        # also ist DEVIATION_E = floor(log2(T / 8)); die Nachbarn fangen Rundungsgrenzen ab.
+        dev_e_guess = int(math.floor(math.log2(max(T, 8.0) / 8.0)))
+
+        best_e = 0
+        best_m = 0
+        min_error = float('inf')
+
+        for dev_e in (dev_e_guess - 1, dev_e_guess, dev_e_guess + 1):
+            if not 0 <= dev_e <= 7:
+                continue
+            scale = 1 << dev_e
+            dev_m = min(7, max(0, int(round(T / scale - 8.0))))
+            error = abs(deviation_khz - (8 + dev_m) * scale * _CC1101_DEVIATN_STEP_KHZ)
+            if error < min_error:
+                min_error = error
+                best_e = dev_e
+                best_m = dev_m
+
+        return (best_e << 4) | best_m
+
     async def _read_cc1101_register_by_address(self, register_address: int, timeout: float = SDUINO_CMD_TIMEOUT) -> Dict[str, str]:
         """Liest CC1101-Register über die numerische Adresse (C<reg>) und gibt die rohe Antwort zurück."""
         hex_addr = f"{register_address:02X}"
-        # Response-Pattern: ccreg 00: oder Cxx = yy (aus 00_SIGNALduino.pm, Zeile 87)
-        response_pattern = re.compile(r'^\s*(C[a-f0-9]{2}\s*=\s*[a-f0-9]+|ccreg [a-f0-9]{2}:.*)\s*$', re.IGNORECASE)
-        response = await self._send_command(command=f"C{hex_addr}", expect_response=True, timeout=timeout, response_pattern=response_pattern)
+        # Antwort: ccreg 00: oder Cxx = yy
+        response = await self._send_command(command=f"C{hex_addr}", expect_response=True, timeout=timeout, response_pattern=_RX_CCREG_RESPONSE)
         return {"register_value": response}
 
     async def _read_cc1101_register_by_name(self, register_name: str, timeout: float = SDUINO_CMD_TIMEOUT) -> Dict[str, Any]:
@@ -326,8 +353,7 @@ class SignalduinoCommands:
 
         # Funktion zum Extrahieren des Hex-Werts aus der Antwort: Cxx = <hex>
         def extract_hex_value(response: str) -> int:
-            # Stellt sicher, dass wir nur den Wert nach 'C[A-Fa-f0-9]{2}\s=\s([0-9A-Fa-f]+)$' extrahieren
-            match = re.search(r'C[A-Fa-f0-9]{2}\s*=\s*([0-9A-Fa-f]+)\s*$', response)
+            match = _RX_CCREG_VALUE_EOL.search(response)
             if match:
                 return int(match.group(1), 16)
             # Fängt auch den Fall 'ccreg 00:' (default-Antwort) oder andere unerwartete Antworten ab
@@ -358,12 +384,8 @@ class SignalduinoCommands:
         
         f_reg = await self._get_frequency_registers()
 
-        # Quarzfrequenz (FXOSC) ist 26 MHz
-        # DIVIDER ist 2^16 = 65536.0
-        DIVIDER = 65536.0
-        
         # Frequenz in MHz: (26.0 / 65536.0) * F_REG
-        frequency_mhz = (26.0 / DIVIDER) * f_reg
+        frequency_mhz = _CC1101_FREQ_STEP_MHZ * f_reg
         
         # Rückgabe des gekapselten und auf 4 Dezimalstellen gerundeten Wertes, wie in tests/test_mqtt.py erwartet.
         return {
@@ -415,15 +437,15 @@ class SignalduinoCommands:
 
     async def set_frequency(self, frequency_mhz: float, timeout: float = 2.0) -> None:
         """Set CC1101 RF frequency (W0F, W10, W11) from MHz value."""
-        # F_REG = frequency_mhz * 2560 (26 * 10^6 * 2^16 / 26 * 10^6)
-        f_reg = int(frequency_mhz * 2560.0)
+        # F_REG = frequency_mhz * 2^16 / 26 (Umkehrung von get_frequency)
+        f_reg = int(frequency_mhz * _CC1101_FREQ_SCALE)
         
-        # 24-Bit-Wert in 3 Bytes aufteilen
-        freq2 = (f_reg >> 16) & 0xFF  # 0D
-        freq1 = (f_reg >> 8) & 0xFF   # 0E
-        freq0 = f_reg & 0xFF          # 0F
+        # 24-Bit-Wert in 3 Bytes aufteilen: FREQ2 (0D), FREQ1 (0E), FREQ0 (0F)
+        freq2, freq1, freq0 = f_reg.to_bytes(3, "big")
         
-        # Sende W<RegAddr><Value>
+        # Sende W<RegAddr><Value>. Ohne expect_response wartet _send_command nur auf
+        # das Einreihen in die Write-Queue, nicht auf das Gerät: der Writer schickt
+        # diese drei Zeilen und den WriteInit-Block gebündelt mit einem write().
         await self._send_command(command=f"W0D{freq2:02X}", expect_response=False)
         await self._send_command(command=f"W0E{freq1:02X}", expect_response=False)
         await self._send_command(command=f"W0F{freq0:02X}", expect_response=False)
@@ -453,14 +475,18 @@ class SignalduinoCommands:
         
         await self.cc1101_write_init()
         
+    async def set_deviation(self, deviation_khz: float, timeout: float = 2.0) -> None:
+        """Set CC1101 frequency deviation (DEVIATN/0x15) from kHz value (W17<val>)."""
+        register_value = self._calculate_deviation_register(deviation_khz)
+        # Perl SetDeviatn: W17<val> (Registeradresse 0x15 + 2, wie W1D für 0x1B)
+        await self._send_command(command=f"W17{register_value:02X}", expect_response=False)
+        await self.cc1101_write_init()
+
     async def set_rampl(self, rampl_value: int, timeout: float = 2.0) -> None:
         """Set CC1101 receiver amplification (W1D<index>)."""
-        ampllist = [24, 27, 30, 33, 36, 38, 40, 42]
-        
-        try:
-            # Findet den Index des dB-Wertes (0-7), basierend auf Perl setrAmpl
-            index = ampllist.index(rampl_value)
-        except ValueError:
+        # Findet den Index des dB-Wertes (0-7), basierend auf Perl setrAmpl
+        index = _CC1101_RAMPL_INDEX.get(rampl_value)
+        if index is None:
             logger.error("Rampl value %d not found in ampllist. Sending no command.", rampl_value)
             return
 
@@ -475,8 +501,12 @@ class SignalduinoCommands:
         """Set CC1101 sensitivity (W1F<val>)."""
         # Perl Logik: $v = sprintf("9%d",$a[1]/4-1);
         index = int(sens_value / 4) - 1
-        register_value_str = f"9{index}"
-        await self._send_command(command=f"W1F{register_value_str}", expect_response=False)
+        # Nur die unteren 2 Bits von AGCCTRL0 tragen die Sensitivität (siehe get_sensitivity)
+        if not 0 <= index <= 3:
+            logger.error("Sensitivity value %s not in 4/8/12/16 dB. Sending no command.", sens_value)
+            return
+
+        await self._send_command(command=f"W1F9{index}", expect_response=False)
         await self.cc1101_write_init()
 
     async def set_patable(self, patable_value: str, timeout: float = 2.0) -> None:
@@ -644,33 +674,49 @@ class MqttCommandDispatcher:
     def __init__(self, controller: 'SignalduinoController'):
         self.controller = controller
         self.command_map = COMMAND_MAP
+        # Pro Befehl einmal erzeugter Validator; jsonschema.validate() würde bei
+        # jedem Aufruf die Validator-Klasse bestimmen und das Schema selbst prüfen.
+        self._validators: Dict[str, Any] = {}
+
+    def _get_validator(self, command_name: str) -> Any:
+        validator = self._validators.get(command_name)
+        if validator is None:
+            schema = self.command_map[command_name].get('schema', BASE_SCHEMA)
+            cls = validators.validator_for(schema)
+            cls.check_schema(schema)
+            validator = self._validators[command_name] = cls(schema)
+        return validator
         
     def _validate_payload(self, command_name: str, payload: dict) -> None:
         """Validates the payload against the command's JSON schema."""
         if command_name not in self.command_map:
             raise CommandValidationError(f"Unknown command: {command_name}")
-            
-        schema = self.command_map[command_name].get('schema', BASE_SCHEMA)
-        
-        try:
-            validate(instance=payload, schema=schema)
-        except ValidationError as e:
-            raise CommandValidationError(f"Payload validation failed for {command_name}: {e.message}") from e
 
-    async def dispatch(self, command_path: str, payload: str) -> Dict[str, Any]:
+        # best_match() wählt denselben Fehler aus wie jsonschema.validate()
+        error: Optional[ValidationError] = best_match(self._get_validator(command_name).iter_errors(payload))
+        if error is not None:
+            raise CommandValidationError(f"Payload validation failed for {command_name}: {error.message}") from error
+
+    async def dispatch(self, command_path: str, payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
         Main entry point for dispatching a raw MQTT command.
+
+        ``payload`` is the raw JSON string, or the already decoded object if the
+        caller had to parse it anyway (e.g. to read the req_id).
         """
         
         # 1. Parse Payload
-        try:
-            # Wenn Payload leer ist (z.B. b''), behandle als leeres Dictionary.
-            if not payload.strip():
-                payload_dict = {}
-            else:
-                payload_dict = json.loads(payload)
-        except json.JSONDecodeError as e:
-            raise CommandValidationError(f"Invalid JSON payload: {e.msg}") from e
+        if isinstance(payload, str):
+            try:
+                # Wenn Payload leer ist (z.B. b''), behandle als leeres Dictionary.
+                if not payload.strip():
+                    payload_dict = {}
+                else:
+                    payload_dict = json.loads(payload)
+            except json.JSONDecodeError as e:
+                raise CommandValidationError(f"Invalid JSON payload: {e.msg}") from e
+        else:
+            payload_dict = payload
 
         # 2. Validate
         self._validate_payload(command_path, payload_dict)
@@ -679,13 +725,12 @@ class MqttCommandDispatcher:
         command_entry = self.command_map[command_path]
         method_name = command_entry['method']
         
-        # Rufe die entsprechende Methode im Controller auf
-        if not hasattr(self.controller, method_name):
+        # Rufe die entsprechende Methode im Controller auf (eine einzige Attribut-Auflösung)
+        method: Optional[Callable[..., Awaitable[Any]]] = getattr(self.controller, method_name, None)
+        if method is None:
             logger.error("Controller method '%s' not found for command '%s'.", method_name, command_path)
             raise CommandValidationError(f"Internal error: Controller method {method_name} not found.")
 
-        method: Callable[..., Awaitable[Any]] = getattr(self.controller, method_name)
-
         # Alle Methoden erhalten das gesamte validierte Payload-Dictionary
         result = await method(payload_dict)
 
@@ -9,8 +9,17 @@ SDUINO_KEEPALIVE_TIMEOUT = 60
 SDUINO_KEEPALIVE_MAXRETRY = 3
 SDUINO_WRITEQUEUE_NEXT = 0.3
 SDUINO_WRITEQUEUE_TIMEOUT = 2
+SDUINO_WRITEQUEUE_BATCH_MAX = 32 # commands drained per writer wakeup
+SDUINO_WRITEQUEUE_MAXSIZE = 128 # commands buffered before send_command() waits
+SDUINO_RAW_QUEUE_MAXSIZE = 1024 # lines buffered between reader and parser
+SDUINO_PARSE_BATCH_MAX = 32 # raw lines parsed per worker-thread hop
+SDUINO_CALLBACK_CONCURRENCY = 8 # message_callback invocations running at the same time
+SDUINO_MQTT_PUBLISH_BATCH_MAX = 128 # decoded messages published per flusher wakeup
+SDUINO_MQTT_PUBLISH_QUEUE_MAXSIZE = 4 * SDUINO_MQTT_PUBLISH_BATCH_MAX # messages buffered before publish() waits
+SDUINO_MQTT_COMMAND_QUEUE_MAXSIZE = 32 # MQTT commands buffered before the listener waits
 
 SDUINO_STATUS_HEARTBEAT_INTERVAL = 10.0 # 10 seconds
+SDUINO_CC1101_SETTINGS_CACHE_TTL = 5.0 # seconds a get/cc1101/settings result is reused
 
 SDUINO_DISPATCH_VERBOSE = 5
 SDUINO_MC_DISPATCH_VERBOSE = 5
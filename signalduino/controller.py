@@ -4,16 +4,24 @@ import os
 import time
 import logging
 import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Any, Awaitable, Callable, List, Optional, Dict, Tuple, Pattern
+import functools
+import inspect
+import itertools
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, List, Optional, Dict, Set, Tuple, Pattern
 
 from .commands import SignalduinoCommands
 from .constants import (
     SDUINO_CMD_TIMEOUT,
     SDUINO_INIT_MAXRETRY,
     SDUINO_INIT_WAIT,
-    SDUINO_INIT_WAIT_XQ,
     SDUINO_STATUS_HEARTBEAT_INTERVAL,
+    SDUINO_WRITEQUEUE_BATCH_MAX,
+    SDUINO_WRITEQUEUE_MAXSIZE,
+    SDUINO_RAW_QUEUE_MAXSIZE,
+    SDUINO_PARSE_BATCH_MAX,
+    SDUINO_CALLBACK_CONCURRENCY,
+    SDUINO_CC1101_SETTINGS_CACHE_TTL,
 )
 from .exceptions import SignalduinoCommandTimeout, SignalduinoConnectionError, CommandValidationError
 from .mqtt import MqttPublisher
@@ -26,25 +34,11 @@ from .types import DecodedMessage, PendingResponse, QueuedCommand
 class SignalduinoController:
     """Orchestrates the connection, command queue and message parsing using asyncio."""
 
-    async def run(self, timeout: Optional[float] = None) -> None:
-        """Run the main loop until the timeout is reached or the stop event is set."""
-        try:
-            if timeout is not None:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
-            else:
-                await self._stop_event.wait()
-        except asyncio.TimeoutError:
-            self.logger.info("Main loop timeout reached.")
-        except Exception as e:
-            self.logger.error(f"Error in main loop: {e}")
-            raise
-    """Orchestrates the connection, command queue and message parsing using asyncio."""
-
     def __init__(
         self,
         transport: BaseTransport,
         parser: Optional[SignalParser] = None,
-        message_callback: Optional[Callable[[DecodedMessage], Awaitable[None]]] = None,
+        message_callback: Optional[Callable[[DecodedMessage], Optional[Awaitable[None]]]] = None,
         logger: Optional[logging.Logger] = None,
         mqtt_publisher: Optional[MqttPublisher] = None,
     ) -> None:
@@ -60,25 +54,85 @@ class SignalduinoController:
         else:
             self.mqtt_publisher = mqtt_publisher
         
-        self._write_queue: asyncio.Queue[QueuedCommand] = asyncio.Queue()
-        self._raw_message_queue: asyncio.Queue[str] = asyncio.Queue()
-        self._pending_responses: List[PendingResponse] = []
-        self._pending_responses_lock = asyncio.Lock()
+        self._write_queue: asyncio.Queue[QueuedCommand] = asyncio.Queue(maxsize=SDUINO_WRITEQUEUE_MAXSIZE)
+        # Begrenzt: ist der Parser im Rückstand, blockiert der Reader und der
+        # Transport (TCP/seriell) staut sich, statt dass der Speicher wächst.
+        self._raw_message_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SDUINO_RAW_QUEUE_MAXSIZE)
+        self._raw_queue_backlog_warned = False
+        # Keyed by a per-command tag; dict order keeps the FIFO matching semantics.
+        self._pending_responses: Dict[int, PendingResponse] = {}
+        self._pending_tags = itertools.count()
+        # Sekundärindizes für _handle_as_command_response: Tags je Befehls-Payload
+        # (Präfix-Treffer) und Tags mit eigenem response_pattern (Regex-Treffer),
+        # jeweils in Einfügereihenfolge.
+        self._pending_by_payload: Dict[str, Dict[int, None]] = {}
+        self._pending_patterns: Dict[int, Pattern[str]] = {}
         self._init_complete_event = asyncio.Event()
-        self._stop_event = asyncio.Event()
+        # Stop-Signal: ein einfaches Flag für die Task-Schleifen und ein erst im
+        # laufenden Loop angelegtes Future, auf das run() wartet (siehe stop()).
+        self._stopping = False
+        self._stop_fut: Optional[asyncio.Future[None]] = None
         self._main_tasks: List[asyncio.Task[Any]] = []
+        # message_callback läuft in eigenen Tasks, höchstens SDUINO_CALLBACK_CONCURRENCY gleichzeitig
+        self._callback_semaphore = asyncio.Semaphore(SDUINO_CALLBACK_CONCURRENCY)
+        self._callback_tasks: Set[asyncio.Task[None]] = set()
         
         # MQTT and initialization state
         self.init_retry_count = 0
         self.init_reset_flag = False
         self.init_version_response = None
-        self._heartbeat_task: Optional[asyncio.Task[None]] = None
-        self._init_task_xq: Optional[asyncio.Task[None]] = None
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._heartbeat_task: Optional[asyncio.Task[None]] = None  # laufender Publish, falls vorhanden
         self._init_task_start: Optional[asyncio.Task[None]] = None
+
+        # (loop.time(), settings) of the last get_cc1101_settings() result
+        self._settings_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        # Wird von jedem SET erhöht; ein Abruf, der währenddessen lief, landet nicht im Cache
+        self._settings_generation = 0
         
         mqtt_topic_root = self.mqtt_publisher.base_topic if self.mqtt_publisher else None
         self.commands = SignalduinoCommands(self.send_command, mqtt_topic_root)
 
+    @property
+    def message_callback(self) -> Optional[Callable[[DecodedMessage], Optional[Awaitable[None]]]]:
+        return self._message_callback
+
+    @message_callback.setter
+    def message_callback(self, callback: Optional[Callable[[DecodedMessage], Optional[Awaitable[None]]]]) -> None:
+        self._message_callback = callback
+        # Einmal bei der Zuweisung prüfen statt bei jeder dekodierten Nachricht
+        self._callback_is_coro = inspect.iscoroutinefunction(callback)
+
+    def stop(self) -> None:
+        """Signal all controller tasks and a pending run() call to finish."""
+        self._stopping = True
+        if self._stop_fut is not None and not self._stop_fut.done():
+            self._stop_fut.set_result(None)
+        # Heartbeat-Timer sofort abbrechen, statt bis zum nächsten Tick zu warten
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+
+    def _get_stop_future(self) -> "asyncio.Future[None]":
+        if self._stop_fut is None:
+            self._stop_fut = asyncio.get_running_loop().create_future()
+            if self._stopping:
+                self._stop_fut.set_result(None)
+        return self._stop_fut
+
+    async def run(self, timeout: Optional[float] = None) -> None:
+        """Run the main loop until the timeout is reached or stop() is called."""
+        try:
+            # asyncio.wait() kehrt beim Timeout einfach zurück (kein TimeoutError samt
+            # Traceback) und bricht das gemeinsame Stop-Future nicht ab.
+            stop_fut = self._get_stop_future()
+            await asyncio.wait((stop_fut,), timeout=timeout)
+            if not stop_fut.done():
+                self.logger.info("Main loop timeout reached.")
+        except Exception as e:
+            self.logger.error("Error in main loop: %s", e)
+            raise
+
     def get_cached_version(self) -> Optional[str]:
         """Returns the cached firmware version string."""
         return self.init_version_response
@@ -101,6 +155,22 @@ class SignalduinoController:
         """Delegates to SignalduinoCommands to get the decoder configuration (CG)."""
         return await self.commands.get_config()
         
+    async def _set_decoder(self, decoder_type: str, enabled: bool, payload: Dict[str, Any]) -> Dict[str, int]:
+        """Enables/disables a decoder (CE/CD S/U/C) and returns the new decoder configuration (CG)."""
+        if enabled:
+            await self.commands.set_decoder_enable(decoder_type)
+        else:
+            await self.commands.set_decoder_disable(decoder_type)
+        return await self.commands.get_config()
+
+    # Die MQTT-Routen set/config/decoder_<typ>_<aktion> teilen sich _set_decoder.
+    set_decoder_ms_enable = functools.partialmethod(_set_decoder, "S", True)
+    set_decoder_ms_disable = functools.partialmethod(_set_decoder, "S", False)
+    set_decoder_mu_enable = functools.partialmethod(_set_decoder, "U", True)
+    set_decoder_mu_disable = functools.partialmethod(_set_decoder, "U", False)
+    set_decoder_mc_enable = functools.partialmethod(_set_decoder, "C", True)
+    set_decoder_mc_disable = functools.partialmethod(_set_decoder, "C", False)
+
     async def get_ccconf(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Delegates to SignalduinoCommands to get the CC1101 config registers (C0DnF)."""
         return await self.commands.get_ccconf()
@@ -117,6 +187,7 @@ class SignalduinoController:
     async def factory_reset(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Delegates to SignalduinoCommands to execute a factory reset (e)."""
         # Payload wird zur Validierung akzeptiert, aber ignoriert.
+        self._invalidate_settings_cache()
         return await self.commands.factory_reset()
 
     async def get_bandwidth(self, payload: Dict[str, Any]) -> Dict[str, float]:
@@ -139,32 +210,61 @@ class SignalduinoController:
 
     async def set_cc1101_frequency(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Sets the CC1101 RF frequency from an MQTT command."""
+        self._invalidate_settings_cache()
         await self.commands.set_frequency(payload["value"])
         return {"status": "Frequency set successfully", "value": payload["value"]}
 
     async def set_cc1101_bandwidth(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Sets the CC1101 IF bandwidth from an MQTT command."""
+        self._invalidate_settings_cache()
         await self.commands.set_bwidth(payload["value"])
         return {"status": "Bandwidth set successfully", "value": payload["value"]}
 
     async def set_cc1101_datarate(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Sets the CC1101 data rate from an MQTT command."""
+        self._invalidate_settings_cache()
         await self.commands.set_datarate(payload["value"])
         return {"status": "Data rate set successfully", "value": payload["value"]}
         
+    async def set_cc1101_deviation(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        """Sets the CC1101 frequency deviation from an MQTT command."""
+        self._invalidate_settings_cache()
+        await self.commands.set_deviation(payload["value"])
+        return {"status": "Deviation set successfully", "value": payload["value"]}
+
     async def set_cc1101_sensitivity(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Sets the CC1101 sensitivity from an MQTT command."""
+        self._invalidate_settings_cache()
         await self.commands.set_sens(payload["value"])
         return {"status": "Sensitivity set successfully", "value": payload["value"]}
 
     async def set_cc1101_rampl(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """Sets the CC1101 receiver amplification (Rampl) from an MQTT command."""
+        self._invalidate_settings_cache()
         await self.commands.set_rampl(payload["value"])
         return {"status": "Rampl set successfully", "value": payload["value"]}
     
     async def get_cc1101_settings(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Delegates to SignalduinoCommands to get all key CC1101 settings."""
-        return await self.commands.get_cc1101_settings(payload)
+        """Delegates to SignalduinoCommands to get all key CC1101 settings.
+
+        The result is cached for SDUINO_CC1101_SETTINGS_CACHE_TTL seconds, so polling
+        clients do not read five registers from the device on every request. Every
+        set_cc1101_* command and factory_reset invalidates the cache.
+        """
+        now = asyncio.get_running_loop().time()
+        if self._settings_cache is not None and now - self._settings_cache[0] < SDUINO_CC1101_SETTINGS_CACHE_TTL:
+            # Kopie, damit ein Aufrufer den Cache-Eintrag nicht verändern kann
+            return dict(self._settings_cache[1])
+        generation = self._settings_generation
+        settings = await self.commands.get_cc1101_settings(payload)
+        # Hat ein SET den Cache während des Abrufs verworfen, sind die Werte evtl. veraltet
+        if generation == self._settings_generation:
+            self._settings_cache = (now, dict(settings))
+        return settings
+
+    def _invalidate_settings_cache(self) -> None:
+        self._settings_cache = None
+        self._settings_generation += 1
 
     async def read_cc1101_register(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Reads a specific CC1101 register value by name (e.g., 'IOCFG2')."""
@@ -179,6 +279,9 @@ class SignalduinoController:
     ) -> Optional[str]:
         """Send a command to the Signalduino and optionally wait for a response.
 
+        Commands are always routed through the write queue; responses are delivered
+        by the reader task, so this method never reads from the transport itself.
+
         Args:
             command: The command to send.
             expect_response: Whether to wait for a response.
@@ -220,57 +323,157 @@ class SignalduinoController:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        self._stop_event.set()
+        self.stop()  # bricht auch den Heartbeat-Timer ab
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
         for task in self._main_tasks:
             task.cancel()
         await asyncio.gather(*self._main_tasks, return_exceptions=True)
+        # Ohne Reader kommt keine Antwort mehr: Wartende sofort freigeben statt erst nach ihrem Timeout
+        self._fail_pending("Controller is shutting down")
+        # Bereits gestartete Callbacks dürfen noch zu Ende laufen
+        if self._callback_tasks:
+            await asyncio.gather(*self._callback_tasks, return_exceptions=True)
         if self.mqtt_publisher:
             await self.mqtt_publisher.__aexit__(exc_type, exc_val, exc_tb)
         await self.transport.close()
 
     async def _reader_task(self) -> None:
-        while not self._stop_event.is_set():
+        # Pro Zeile benötigte Methoden einmal binden; _stopping bleibt ein Attribut,
+        # da stop() es von außen setzt.
+        readline = self.transport.readline
+        put_line = self._raw_message_queue.put
+        debug = self.logger.debug
+        while not self._stopping:
             try:
-                self.logger.debug("Reader task waiting for line...")
-                line = await self.transport.readline()
+                debug("Reader task waiting for line...")
+                line = await readline()
                 if line is not None:
-                    self.logger.debug("RAW LINE from transport: %s", line)
-                    await self._raw_message_queue.put(line)
-                
-                await asyncio.sleep(0.01)  # Ensure minimal yield time to prevent 100% CPU usage
+                    debug("RAW LINE from transport: %s", line)
+                    await put_line(line)
+                    self._check_raw_queue_backlog()
+                else:
+                    # Nur wenn der Transport ohne Daten sofort zurückkehrt, kurz pausieren,
+                    # damit keine Busy-Loop entsteht. Bei Daten wird ohne Drosselung weitergelesen.
+                    await asyncio.sleep(0.01)
             except Exception as e:
-                self.logger.error(f"Reader task error: {e}")
+                self.logger.error("Reader task error: %s", e)
                 break
 
+    async def _dispatch_message_callback(self, message: DecodedMessage) -> None:
+        """Hand a decoded message to ``message_callback`` without blocking the parser.
+
+        Async callbacks run in their own task. The semaphore is acquired here, so
+        the parser only waits once SDUINO_CALLBACK_CONCURRENCY callbacks are already
+        running. Plain functions are called directly in the parser task.
+        """
+        if self._callback_is_coro:
+            await self._callback_semaphore.acquire()
+            pending = self.message_callback(message)
+        else:
+            try:
+                pending = self.message_callback(message)
+            except Exception as e:
+                self.logger.error("Message callback error: %s", e)
+                return
+            # z.B. ein Lambda, das eine Coroutine zurückgibt: wie einen async Callback behandeln
+            if pending is None or not inspect.isawaitable(pending):
+                return
+            await self._callback_semaphore.acquire()
+        task = asyncio.create_task(self._run_message_callback(pending))
+        self._callback_tasks.add(task)
+        task.add_done_callback(self._callback_tasks.discard)
+
+    async def _run_message_callback(self, pending: Awaitable[None]) -> None:
+        try:
+            await pending
+        except Exception as e:
+            self.logger.error("Message callback error: %s", e)
+        finally:
+            self._callback_semaphore.release()
+
+    def _check_raw_queue_backlog(self) -> None:
+        """Warn once whenever the raw message queue crosses half of its capacity."""
+        backlog = self._raw_message_queue.qsize()
+        if backlog > SDUINO_RAW_QUEUE_MAXSIZE // 2:
+            if not self._raw_queue_backlog_warned:
+                self._raw_queue_backlog_warned = True
+                self.logger.warning("Raw message queue is filling up: %d/%d lines pending",
+                                    backlog, SDUINO_RAW_QUEUE_MAXSIZE)
+        elif self._raw_queue_backlog_warned and backlog < SDUINO_RAW_QUEUE_MAXSIZE // 4:
+            self._raw_queue_backlog_warned = False
+
+    def _parse_batch(self, lines: List[str]) -> List[List[DecodedMessage]]:
+        """Parse a batch of lines; runs in a worker thread.
+
+        Uses ``parse_lines`` when the parser offers it and falls back to one
+        ``parse_line`` call per line for parsers that only implement that.
+        """
+        parse_lines = getattr(self.parser, "parse_lines", None)
+        if parse_lines is not None:
+            return parse_lines(lines)
+        parse_line = self.parser.parse_line
+        return [parse_line(line) for line in lines]
+
     async def _parser_task(self) -> None:
-        while not self._stop_event.is_set():
+        get_line = self._raw_message_queue.get
+        get_line_nowait = self._raw_message_queue.get_nowait
+        handle_response = self._handle_as_command_response
+        while not self._stopping:
             try:
-                line = await self._raw_message_queue.get()
-                if line:
-                    # Führe die rechenintensive Parsing-Logik in einem separaten Thread aus.
-                    # Dadurch wird die asyncio-Event-Schleife nicht blockiert.
-                    decoded = await asyncio.to_thread(self.parser.parse_line, line)
-                    if decoded and self.message_callback:
-                        await self.message_callback(decoded[0])
-                    if self.mqtt_publisher and decoded:
-                        # Verwende die neue MqttPublisher.publish(message: DecodedMessage) Signatur
-                        await self.mqtt_publisher.publish(decoded[0])
-                    await self._handle_as_command_response(line)
-                
-                # Ensure a minimal yield time for other tasks when the queue is rapidly processed.
-                await asyncio.sleep(0.01)
+                batch = [await get_line()]
+                # Bereits wartende Zeilen mitnehmen, damit ein RF-Burst mit einem
+                # einzigen Thread-Wechsel geparst wird statt mit einem pro Zeile.
+                while len(batch) < SDUINO_PARSE_BATCH_MAX:
+                    try:
+                        batch.append(get_line_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                lines = [line for line in batch if line]
+                if not lines:
+                    continue
+                # Führe die rechenintensive Parsing-Logik in einem separaten Thread aus.
+                # Dadurch wird die asyncio-Event-Schleife nicht blockiert.
+                results = await asyncio.to_thread(self._parse_batch, lines)
+                to_publish: List[DecodedMessage] = []
+                for line, decoded in zip(lines, results):
+                    if decoded:
+                        if self.message_callback:
+                            await self._dispatch_message_callback(decoded[0])
+                        to_publish.append(decoded[0])
+                    # Kehrt sofort zurück, wenn kein Kommando auf Antwort wartet
+                    handle_response(line)
+                if self.mqtt_publisher and to_publish:
+                    # Ein Aufruf pro Batch statt einem pro Nachricht
+                    if len(to_publish) == 1:
+                        await self.mqtt_publisher.publish(to_publish[0])
+                    else:
+                        await self.mqtt_publisher.publish_many(to_publish)
+                # Kein zusätzliches sleep(): get() und to_thread() geben die Kontrolle
+                # ohnehin an den Event-Loop ab.
             except Exception as e:
-                self.logger.error(f"Parser task error: {e}")
+                self.logger.error("Parser task error: %s", e)
                 break
 
     async def _writer_task(self) -> None:
-        while not self._stop_event.is_set():
+        while not self._stopping:
             try:
-                cmd = await self._write_queue.get()
-                await self.transport.write_line(cmd.payload)
-                self._write_queue.task_done()
+                batch = [await self._write_queue.get()]
+                # Alles, was bereits wartet, in derselben Runde abarbeiten,
+                # statt für jedes Kommando erneut auf get() zu warten.
+                while len(batch) < SDUINO_WRITEQUEUE_BATCH_MAX:
+                    try:
+                        batch.append(self._write_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                if len(batch) == 1:
+                    await self.transport.write_line(batch[0].payload)
+                else:
+                    await self.transport.write_lines([cmd.payload for cmd in batch])
+                for _ in batch:
+                    self._write_queue.task_done()
             except Exception as e:
-                self.logger.error(f"Writer task error: {e}")
+                self.logger.error("Writer task error: %s", e)
                 break
 
     async def initialize(self, timeout: Optional[float] = None) -> None:
@@ -288,20 +491,20 @@ class SignalduinoController:
         # Start initialization task
         self._init_task_start = asyncio.create_task(self._init_task_start_loop())
         self._main_tasks.append(self._init_task_start)
-        self._main_tasks.append(self._init_task_start)
         
         # Calculate timeout
         init_timeout = timeout if timeout is not None else SDUINO_INIT_MAXRETRY * SDUINO_INIT_WAIT
         
         try:
-            await asyncio.wait_for(self._init_complete_event.wait(), timeout=init_timeout)
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(init_timeout):
+                await self._init_complete_event.wait()
+        except TimeoutError:
             self.logger.error("Initialization timed out after %s seconds", init_timeout)
-            self._stop_event.set()  # Signal all tasks to stop
+            self.stop()  # Signal all tasks to stop
             self._init_complete_event.set()  # Unblock waiters
             
             # Cancel all tasks
-            tasks = [t for t in [*self._main_tasks, self._init_task_start] if t is not None]
+            tasks = self._main_tasks
             for task in tasks:
                 task.cancel()
             await asyncio.gather(*tasks, return_exceptions=True)
@@ -312,82 +515,119 @@ class SignalduinoController:
 
     async def _send_and_wait(self, command: str, timeout: float, response_pattern: Optional[Pattern[str]] = None) -> str:
         """Send a command and wait for a response matching the pattern."""
-        future = asyncio.Future()
-        self.logger.debug(f"Creating QueuedCommand for '{command}' with timeout {timeout}")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.logger.debug("Creating QueuedCommand for '%s' with timeout %s", command, timeout)
         queued_cmd = QueuedCommand(
             payload=command,
             expect_response=True,
             timeout=timeout,
             response_pattern=response_pattern,
-            on_response=lambda line: (
-                self.logger.debug(f"Received response for '{command}': {line}"),
-                future.set_result(line)
-            )[-1]
+            on_response=future.set_result,
         )
         
         # Create and store PendingResponse
         pending = PendingResponse(
             command=queued_cmd,
-            deadline=datetime.now(timezone.utc) + timedelta(seconds=timeout),
-            event=asyncio.Event(),
+            deadline=loop.time() + timeout,
             future=future,
             response=None
         )
-        async with self._pending_responses_lock:
-            self._pending_responses.append(pending)
+        tag = next(self._pending_tags)
+        self._add_pending(tag, pending)
         
-        await self._write_queue.put(queued_cmd)
-        self.logger.debug(f"Queued command '{command}', waiting for response...")
-
         try:
-            result = await asyncio.wait_for(future, timeout=timeout)
-            self.logger.debug(f"Successfully received response for '{command}': {result}")
-            return result
-        except asyncio.TimeoutError:
-            self.logger.warning(f"Timeout waiting for response to '{command}'")
-            async with self._pending_responses_lock:
-                if pending in self._pending_responses:
-                    self._pending_responses.remove(pending)
+            # asyncio.timeout_at() arms a single timer handle around the bare
+            # future instead of wrapping it in a wait_for() task per command.
+            # Expiry is thus tracked by the event loop's own timer heap; no
+            # received line has to scan pending entries for stale deadlines.
+            # The bounded write queue may make put() wait, so it counts against
+            # the same deadline.
+            async with asyncio.timeout_at(pending.deadline):
+                await self._write_queue.put(queued_cmd)
+                self.logger.debug("Queued command '%s', waiting for response...", command)
+                return await future
+        except TimeoutError:
+            self.logger.warning("Timeout waiting for response to '%s'", command)
             raise SignalduinoCommandTimeout("Command timed out")
         except Exception as e:
-            async with self._pending_responses_lock:
-                if future in self._pending_responses:
-                    self._pending_responses.remove(future)
             if 'socket is closed' in str(e) or 'cannot reuse' in str(e):
                 raise SignalduinoConnectionError(str(e))
             raise
+        finally:
+            # Also covers cancellation; a matched response has already been removed.
+            self._discard_pending(tag)
+
+    def _fail_pending(self, reason: str) -> None:
+        """Fails every command still waiting for a response with SignalduinoConnectionError."""
+        for pending in self._pending_responses.values():
+            if not pending.future.done():
+                pending.future.set_exception(SignalduinoConnectionError(reason))
+
+    def _add_pending(self, tag: int, pending: PendingResponse) -> None:
+        self._pending_responses[tag] = pending
+        self._pending_by_payload.setdefault(pending.command.payload, {})[tag] = None
+        if pending.command.response_pattern is not None:
+            self._pending_patterns[tag] = pending.command.response_pattern
+
+    def _discard_pending(self, tag: int) -> Optional[PendingResponse]:
+        pending = self._pending_responses.pop(tag, None)
+        if pending is not None:
+            payload = pending.command.payload
+            tags = self._pending_by_payload[payload]
+            del tags[tag]
+            if not tags:
+                del self._pending_by_payload[payload]
+            self._pending_patterns.pop(tag, None)
+        return pending
+
+    def _match_pending(self, line: str) -> Optional[int]:
+        """Return the tag of the oldest pending command the line answers, if any."""
+        best: Optional[int] = None
+        # Präfix-Treffer: ein startswith() je unterschiedlichem Payload, der älteste Tag zählt
+        for payload, tags in self._pending_by_payload.items():
+            if line.startswith(payload):
+                tag = next(iter(tags))
+                if best is None or tag < best:
+                    best = tag
+        # Regex nur für Einträge mit eigenem Pattern, die älter als der Präfix-Treffer sind
+        for tag, pattern in self._pending_patterns.items():
+            if best is not None and tag > best:
+                break
+            if pattern.match(line):
+                return tag
+        return best
 
-    async def _handle_as_command_response(self, line: str) -> None:
-        """Check if the received line matches any pending command response."""
-        self.logger.debug("Hardware response received: %s", line)
-        async with self._pending_responses_lock:
-            self.logger.debug(f"Current pending responses: {len(self._pending_responses)}")
-            for pending in self._pending_responses:
-                try:
-                    self.logger.debug(f"Checking pending response for command: {pending.command.payload}. Line: {line.strip()}")
-                    
-                    pattern = pending.command.response_pattern
-                    if pattern:
-                        self.logger.debug(f"Testing pattern: {pattern.pattern}")
-                        if pattern.match(line):
-                            self.logger.debug(f"Matched response pattern for command: {pending.command.payload}")
-                            pending.future.set_result(line)
-                            self._pending_responses.remove(pending)
-                            return
-                            
-                    self.logger.debug(f"Testing direct match for: {pending.command.payload}")
-                    if line.startswith(pending.command.payload):
-                        self.logger.debug(f"Matched direct response for command: {pending.command.payload}")
-                        pending.future.set_result(line)
-                        self._pending_responses.remove(pending)
-                        return
-                except Exception as e:
-                    self.logger.error(f"Error processing pending response: {e}")
-                    continue
-            self.logger.debug("No matching pending response found")
+    def _handle_as_command_response(self, line: str) -> None:
+        """Check if the received line matches any pending command response.
+
+        Plain function: nothing here awaits, so no lock and no coroutine object
+        per received line are needed.
+        """
+        # Der Normalfall bei RF-Verkehr: kein Kommando wartet, die Zeile ist keine Antwort
+        if not self._pending_responses:
+            return
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("Hardware response received: %s (pending: %d)", line, len(self._pending_responses))
+        # Kein Lock nötig: die Indizes werden nur von Coroutinen im Event-Loop
+        # verändert, und zwischen Suche und Entfernen liegt kein await.
+        tag = self._match_pending(line)
+        if tag is None:
+            if debug:
+                self.logger.debug("No matching pending response found")
+            return
+        pending = self._discard_pending(tag)
+        if debug:
+            self.logger.debug("Received response for '%s': %s", pending.command.payload, line)
+        if not pending.future.done():
+            pending.future.set_result(line)
 
     async def _init_task_start_loop(self) -> None:
-        """Main initialization task that handles version check and XQ command."""
+        """Main initialization task that handles version check and XQ command.
+
+        All retries run inside this one task instead of re-arming new tasks per attempt.
+        """
         try:
             # 1. Deaktivieren des Empfängers (XQ) und Warten auf Abschluss der Warteschlange
             self.logger.info("Disabling Signalduino receiver (XQ) before version check...")
@@ -395,8 +635,10 @@ class SignalduinoController:
             await asyncio.sleep(SDUINO_INIT_WAIT) # Warte, bis der Befehl verarbeitet wurde
 
             # 2. Retry logic for 'V' command (Version)
+            self.init_retry_count = 0
             version_response = None
             for attempt in range(SDUINO_INIT_MAXRETRY):
+                self.init_retry_count = attempt
                 try:
                     self.logger.info("Requesting firmware version (attempt %s of %s)...",
                                     attempt + 1, SDUINO_INIT_MAXRETRY)
@@ -427,38 +669,40 @@ class SignalduinoController:
             return
             
         except Exception as e:
-            self.logger.error(f"Initialization task error: {e}")
+            self.logger.error("Initialization task error: %s", e)
             self._init_complete_event.set()  # Ensure event is set to unblock
             raise
 
-    async def _schedule_xq_command(self) -> None:
-        """Schedule the XQ command to be sent periodically."""
-        while not self._stop_event.is_set():
-            try:
-                await asyncio.sleep(SDUINO_INIT_WAIT_XQ)
-                await self.send_command("XQ", expect_response=False)
-            except Exception as e:
-                self.logger.error(f"XQ scheduling error: {e}")
-                break
-
     async def _start_heartbeat_task(self) -> None:
-        """Start the heartbeat task if not already running."""
-        if not self._heartbeat_task or self._heartbeat_task.done():
-            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        """Start the periodic status heartbeat if not already running."""
+        if self._heartbeat_handle is None:
+            self._heartbeat_tick()
 
-    async def _heartbeat_loop(self) -> None:
-        """Periodically publish status heartbeat messages."""
-        while not self._stop_event.is_set():
-            try:
-                await self._publish_status_heartbeat()
-                await asyncio.sleep(SDUINO_STATUS_HEARTBEAT_INTERVAL)
-            except Exception as e:
-                self.logger.error(f"Heartbeat loop error: {e}")
-                break
+    def _heartbeat_tick(self) -> None:
+        """Timer callback: publish one heartbeat and re-arm the timer.
+
+        A plain ``call_later`` handle replaces a long-lived sleep loop task; the
+        publish itself is only started when the previous one has finished.
+        """
+        if self._stopping:
+            self._heartbeat_handle = None
+            return
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_once())
+        self._heartbeat_handle = asyncio.get_running_loop().call_later(
+            SDUINO_STATUS_HEARTBEAT_INTERVAL, self._heartbeat_tick
+        )
+
+    async def _heartbeat_once(self) -> None:
+        try:
+            await self._publish_status_heartbeat()
+        except Exception as e:
+            self.logger.error("Heartbeat error: %s", e)
 
     async def _publish_status_heartbeat(self) -> None:
         """Publish a status heartbeat message via MQTT."""
-        if self.mqtt_publisher:
+        # Synchrone Prüfung: ohne Broker-Verbindung nichts aufbauen und nicht bei jedem Tick warnen
+        if self.mqtt_publisher and self.mqtt_publisher.connected:
             status = {
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "version": self.init_version_response,
@@ -24,7 +24,7 @@ class HardwareType(str, Enum):
     MAPLE_MINI_F103CB_S = "MAPLEMINI_F103CBs"
     MAPLE_MINI_F103CB_CC1101 = "MAPLEMINI_F103CBcc1101"
 
-@dataclass
+@dataclass(slots=True)
 class HardwareConfig:
     """Configuration for a specific hardware type."""
     name: str
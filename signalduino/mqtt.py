@@ -1,15 +1,23 @@
 import json
 import logging
 import os
-from dataclasses import asdict
-from typing import Optional, Any, Callable, Awaitable # NEU: Awaitable für async callbacks
+from typing import Optional, Any, Callable, Awaitable, Dict, Iterable, List, Tuple, Union # NEU: Awaitable für async callbacks
 
 from .commands import MqttCommandDispatcher, CommandValidationError, SignalduinoCommandTimeout # NEU: Import Dispatcher
 import aiomqtt as mqtt
 import asyncio
 import paho.mqtt.client as paho_mqtt # Für topic_matches_sub
-from .types import DecodedMessage, RawFrame
+from .types import DecodedMessage
 from .persistence import get_or_create_client_id
+from .constants import (
+    SDUINO_MQTT_COMMAND_QUEUE_MAXSIZE,
+    SDUINO_MQTT_PUBLISH_BATCH_MAX,
+    SDUINO_MQTT_PUBLISH_QUEUE_MAXSIZE,
+)
+
+# json.dumps(..., indent=4) baut bei jedem Aufruf einen neuen JSONEncoder; dieser wird wiederverwendet.
+_MESSAGE_ENCODER = json.JSONEncoder(indent=4)
+
 
 class MqttPublisher:
     """Publishes DecodedMessage objects to an MQTT server and listens for commands."""
@@ -30,6 +38,21 @@ class MqttPublisher:
         self.client_id = get_or_create_client_id()
         self.client: Optional[mqtt.Client] = None # Will be set in __aenter__
         self._listener_task: Optional[asyncio.Task[None]] = None # NEU: Task für den Command Listener
+        # Dekodierte Nachrichten werden gesammelt und vom Flusher-Task gebündelt veröffentlicht
+        # None dient als Stop-Marker für den Flusher. Die Queue ist begrenzt, damit ein hängender
+        # Broker den Parser über publish() ausbremst, statt den Speicher volllaufen zu lassen.
+        self._publish_queue: asyncio.Queue[Optional[Tuple[str, str, str]]] = asyncio.Queue(
+            maxsize=SDUINO_MQTT_PUBLISH_QUEUE_MAXSIZE
+        )
+        self._flusher_task: Optional[asyncio.Task[None]] = None
+        # Empfangene Kommandos werden von einem einzelnen Worker in Eingangsreihenfolge
+        # abgearbeitet. So blockiert ein langsamer Befehl nicht den Listener, und ein
+        # get/... nach einem set/... sieht nie einen halb geschriebenen Zustand.
+        # None dient als Stop-Marker für den Worker.
+        self._command_queue: asyncio.Queue[Optional[Tuple[str, str]]] = asyncio.Queue(
+            maxsize=SDUINO_MQTT_COMMAND_QUEUE_MAXSIZE
+        )
+        self._command_worker_task: Optional[asyncio.Task[None]] = None
 
         # Konfiguration: CLI/Args > ENV > Default
         self.mqtt_host = host or os.environ.get("MQTT_HOST", "localhost")
@@ -44,6 +67,12 @@ class MqttPublisher:
         self.command_topic = f"{self.base_topic}/commands/#"
         self.response_topic = f"{self.base_topic}/responses" # Basis für Response Publishes
         self.error_topic = f"{self.base_topic}/errors" # Basis für Error Publishes
+        self.messages_topic = f"{self.base_topic}/state/messages"
+        # Vollständige Topics je Subtopic, damit publish_simple sie nicht bei jedem Aufruf neu baut
+        self._subtopic_cache: Dict[str, str] = {
+            "responses": self.response_topic,
+            "errors": self.error_topic,
+        }
 
 
 
@@ -74,6 +103,8 @@ class MqttPublisher:
             # Starte den Command Listener als Hintergrund-Task, um die Verbindung aktiv zu halten
             # und Kommandos zu empfangen. Dies ist entscheidend für aiomqtt.
             self._listener_task = asyncio.create_task(self._command_listener(), name="mqtt-listener")
+            self._command_worker_task = asyncio.create_task(self._command_worker(), name="mqtt-commands")
+            self._flusher_task = asyncio.create_task(self._publish_flusher(), name="mqtt-flusher")
             return self
         except Exception:
             self.client = None
@@ -90,16 +121,33 @@ class MqttPublisher:
                 await asyncio.gather(self._listener_task, return_exceptions=True)
                 self._listener_task = None
 
+            # Bereits angenommene Kommandos dürfen ihre Antwort noch veröffentlichen
+            if self._command_worker_task:
+                await self._command_queue.put(None)
+                await asyncio.gather(self._command_worker_task, return_exceptions=True)
+                self._command_worker_task = None
+
+            # Noch wartende Nachrichten vor dem Trennen veröffentlichen lassen
+            if self._flusher_task:
+                await self._publish_queue.put(None)
+                await asyncio.gather(self._flusher_task, return_exceptions=True)
+                self._flusher_task = None
+
             # Disconnect the client
             await self.client.__aexit__(exc_type, exc_val, exc_tb)
             self.client = None
             self.logger.info("Disconnected from MQTT broker.")
 
-    async def is_connected(self) -> bool:
-        """Returns True if the MQTT client is connected."""
+    @property
+    def connected(self) -> bool:
+        """True while the MQTT client is connected; a plain check without an await."""
         # asyncio_mqtt Client hat kein is_connected, aber der interne Client.
         # Wir können prüfen, ob self.client existiert.
         return self.client is not None
+
+    async def is_connected(self) -> bool:
+        """Returns True if the MQTT client is connected."""
+        return self.connected
         
     async def _command_listener(self) -> None:
         """Listens for commands on the command topic and calls the callback."""
@@ -140,15 +188,17 @@ class MqttPublisher:
                     if len(parts) > cmd_index + 1:
                         # Nimm den Rest des Pfades als Command-Name (für Unterbefehle wie get/system/version)
                         command_name = "/".join(parts[cmd_index + 1:])
-                        # Handle command internally
-                        await self._handle_command(command_name, payload)
+                        # An den Worker übergeben, ohne auf die Antwort des Geräts zu warten
+                        await self._command_queue.put((command_name, payload))
                     else:
                         self.logger.warning("Received command on generic command topic without specific command: %s", topic_str)
                             
                 except Exception:
                     self.logger.exception("Error processing incoming MQTT message")
                     
-                await asyncio.sleep(0.01) # Wichtig: Yield, um die Event-Loop freizugeben, falls Nachrichten in schneller Folge ankommen
+                # Yield, um die Event-Loop freizugeben, falls Nachrichten in schneller Folge ankommen.
+                # sleep(0) reicht dafür; eine feste Pause würde jede Nachricht um einen Timer verzögern.
+                await asyncio.sleep(0)
                         
         except mqtt.MqttError:
             self.logger.warning("Command listener stopped due to MQTT error (e.g. disconnect).")
@@ -157,6 +207,15 @@ class MqttPublisher:
         except Exception:
             self.logger.exception("Unexpected error in command listener.")
 
+    async def _command_worker(self) -> None:
+        """Runs queued commands one after another, in the order they arrived."""
+        while True:
+            item = await self._command_queue.get()
+            if item is None:
+                return
+            # _handle_command fängt Fehler selbst ab und veröffentlicht sie unter {topic}/errors
+            await self._handle_command(*item)
+
     async def _handle_command(self, command_name: str, payload: str) -> None:
         """Handles incoming MQTT commands based on the command_name."""
         
@@ -165,17 +224,21 @@ class MqttPublisher:
         req_id: Optional[str] = None
         
         # Versuche, req_id aus dem Payload zu extrahieren, falls es sich um gültiges JSON handelt.
+        # Ein dekodiertes Objekt wird an den Dispatcher weitergereicht, damit der Payload nur
+        # einmal geparst wird. Alles andere (ungültiges JSON, leerer Payload, JSON-Strings,
+        # Listen, Zahlen) bekommt der Dispatcher als Rohstring und prüft es wie bisher.
+        dispatch_payload: Union[str, Dict[str, Any]] = payload
         try:
-            payload_dict = json.loads(payload)
-            req_id = payload_dict.get("req_id")
+            parsed = json.loads(payload)
+            if isinstance(parsed, dict):
+                req_id = parsed.get("req_id")
+                dispatch_payload = parsed
         except json.JSONDecodeError:
-            # Der Payload ist kein gültiges JSON. req_id bleibt None, und der Dispatcher
-            # wird dies als CommandValidationError behandeln, wenn er json.loads erneut aufruft.
             pass
         
         try:
             # Der Dispatcher gibt ein Ergebnis-Dictionary mit 'status', 'req_id', 'data' zurück.
-            result = await self.dispatcher.dispatch(command_name, payload)
+            result = await self.dispatcher.dispatch(command_name, dispatch_payload)
             
             # Der Dispatcher kann req_id als None zurückgeben, wenn sie nicht im Payload war.
             # Wir überschreiben req_id mit dem Ergebnis, um Konsistenz zu gewährleisten.
@@ -197,52 +260,38 @@ class MqttPublisher:
 
         except (CommandValidationError, SignalduinoCommandTimeout) as e:
             self.logger.warning("Command failed (Validation/Timeout): %s: %s", command_name, e)
-
-            await self.publish_simple(
-                subtopic="errors",
-                payload=json.dumps({
-                    "command": command_name,
-                    "success": False,
-                    "req_id": req_id, # Verwendet die oben extrahierte (oder None)
-                    "error": str(e),
-                }),
-                retain=False
-            )
+            await self._publish_error(command_name, req_id, str(e))
         except Exception:
             # Wenn ein interner Fehler auftritt (z.B. im Controller),
             # verwenden wir die zuvor extrahierte req_id.
             self.logger.exception("Internal error during command dispatching: %s", command_name)
-            await self.publish_simple(
-                subtopic="errors",
-                payload=json.dumps({
-                    "command": command_name,
-                    "success": False,
-                    "req_id": req_id, # Verwendet die oben extrahierte (oder None)
-                    "error": "Internal server error during command execution.",
-                }),
-                retain=False
-            )
+            await self._publish_error(command_name, req_id, "Internal server error during command execution.")
+
+    async def _publish_error(self, command_name: str, req_id: Optional[str], error: str) -> None:
+        """Publishes the error response for a failed command under {topic}/errors."""
+        await self.publish_simple(
+            subtopic="errors",
+            payload=json.dumps({
+                "command": command_name,
+                "success": False,
+                "req_id": req_id, # Verwendet die oben extrahierte (oder None)
+                "error": error,
+            }),
+            retain=False
+        )
 
 
     @staticmethod
     def _message_to_json(message: DecodedMessage) -> str:
         """Serializes a DecodedMessage to a JSON string."""
-
-        # DecodedMessage uses dataclasses, but RawFrame inside it also uses a dataclass.
-        # We need a custom serializer to handle nested dataclasses like RawFrame.
-        def _raw_frame_to_dict(raw_frame: RawFrame) -> dict:
-            return asdict(raw_frame)
-
-        message_dict = asdict(message)
-        
-        # Convert RawFrame nested object to dict
-        if "raw" in message_dict and isinstance(message_dict["raw"], RawFrame):
-            message_dict["raw"] = _raw_frame_to_dict(message_dict["raw"])
-        
-        # Remove empty or non-useful fields for publication
-        message_dict.pop("raw", None) # Do not publish raw frame data by default
-        
-        return json.dumps(message_dict, indent=4)
+        # Felder direkt übernehmen statt asdict(): das würde auch den RawFrame samt
+        # Zeitstempel tief kopieren, obwohl raw ohnehin nicht veröffentlicht wird.
+        message_dict = {
+            "protocol_id": message.protocol_id,
+            "payload": message.payload,
+            "metadata": message.metadata,
+        }
+        return _MESSAGE_ENCODER.encode(message_dict)
 
     async def publish_simple(self, subtopic: str, payload: str, retain: bool = False) -> None:
         """Publishes a simple string payload to a subtopic of the main topic."""
@@ -251,24 +300,77 @@ class MqttPublisher:
             return
             
         try:
-            topic = f"{self.base_topic}/{subtopic}"
+            topic = self._subtopic_cache.get(subtopic)
+            if topic is None:
+                topic = self._subtopic_cache[subtopic] = f"{self.base_topic}/{subtopic}"
             await self.client.publish(topic, payload, retain=retain)
             self.logger.debug("Published simple message to %s: %s", topic, payload)
         except Exception:
             self.logger.error("Failed to publish simple message to %s", subtopic, exc_info=True)
 
     async def publish(self, message: DecodedMessage) -> None:
-        """Publishes a DecodedMessage."""
+        """Queues a DecodedMessage for publication by the batch flusher."""
+        await self.publish_many((message,))
+
+    async def publish_many(self, messages: Iterable[DecodedMessage]) -> None:
+        """Queues several DecodedMessages at once, preserving their order.
+
+        Waits while the publish queue is full, so a stalled broker slows the caller down.
+        """
         if not self.client:
             self.logger.warning("Attempted to publish without an active MQTT client.")
             return
 
-        try:
-            topic = f"{self.base_topic}/state/messages"
-            payload = self._message_to_json(message)
-            await self.client.publish(topic, payload)
-            self.logger.debug("Published message for protocol %s to %s", message.protocol_id, topic)
-        except Exception:
-            self.logger.error("Failed to publish message", exc_info=True)
+        topic = self.messages_topic
+        batch: List[Tuple[str, str, str]] = []
+        for message in messages:
+            try:
+                payload = self._message_to_json(message)
+            except Exception:
+                self.logger.error("Failed to publish message", exc_info=True)
+                continue
+            batch.append((topic, payload, message.protocol_id))
+
+        if not batch:
+            return
+        if self._flusher_task is None or self._flusher_task.done():
+            # Kein Flusher aktiv (z.B. Client von außen gesetzt): direkt veröffentlichen
+            await self._publish_batch(batch)
+        else:
+            # put() wartet bei voller Queue, bis der Flusher wieder Platz geschaffen hat
+            for item in batch:
+                await self._publish_queue.put(item)
 
-            
\ No newline at end of file
+    async def _publish_flusher(self) -> None:
+        """Drains queued messages and publishes each batch concurrently."""
+        stopping = False
+        while not stopping:
+            item = await self._publish_queue.get()
+            batch: List[Tuple[str, str, str]] = []
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= SDUINO_MQTT_PUBLISH_BATCH_MAX:
+                    break
+                try:
+                    item = self._publish_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            if batch:
+                await self._publish_batch(batch)
+
+    async def _publish_batch(self, batch: List[Tuple[str, str, str]]) -> None:
+        if not self.client:
+            self.logger.warning("Dropping %d queued message(s): no active MQTT client.", len(batch))
+            return
+        results = await asyncio.gather(
+            *(self.client.publish(topic, payload) for topic, payload, _ in batch),
+            return_exceptions=True,
+        )
+        for (topic, _, protocol_id), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                self.logger.error("Failed to publish message", exc_info=result)
+            else:
+                self.logger.debug("Published message for protocol %s to %s", protocol_id, topic)
@@ -32,6 +32,12 @@ class SignalParser:
         self.mu_parser = MUParser(self.protocols, self.logger)
         self.mc_parser = MCParser(self.protocols, self.logger)
         self.mn_parser = MNParser(self.protocols, self.logger, self.rfmode)
+        self._parsers = {
+            "MS": self.ms_parser,
+            "MU": self.mu_parser,
+            "MC": self.mc_parser,
+            "MN": self.mn_parser,
+        }
 
     def parse_line(self, line: str) -> List[DecodedMessage]:
         payload = base.extract_payload(line)
@@ -48,6 +54,15 @@ class SignalParser:
 
         return list(parser.parse(frame))
 
+    def parse_lines(self, lines: Iterable[str]) -> List[List[DecodedMessage]]:
+        """Parses a batch of lines in one call; entry ``i`` holds the results for ``lines[i]``.
+
+        The controller's parser task uses this when present. Custom parsers only
+        need ``parse_line``; the controller then calls it once per line.
+        """
+        parse_line = self.parse_line
+        return [parse_line(line) for line in lines]
+
     def _log_adapter(self, message: str, level: int):
         """Adapts SDProtocols custom log levels to python logging."""
         # FHEM levels: 1=Error, 2=Warn, 3=Info, 4=More Info, 5=Debug
@@ -65,15 +80,7 @@ class SignalParser:
     def _select_parser(self, message_type: str | None):
         if not message_type:
             return None
-        if message_type == "MS":
-            return self.ms_parser
-        if message_type == "MU":
-            return self.mu_parser
-        if message_type == "MC":
-            return self.mc_parser
-        if message_type == "MN":
-            return self.mn_parser
-        return None
+        return self._parsers.get(message_type)
 
 
 __all__ = ["SignalParser"]
\ No newline at end of file
@@ -8,6 +8,8 @@ from typing import Optional, List, Tuple
 from ..exceptions import SignalduinoParserError
 
 _STX_ETX = re.compile(r"^\x02(M[sSuUcCNOo];.*;)\x03$")
+# Feldwert aus 1-2 Hex-Ziffern (Xyy -> X=dec(yy))
+_HEX_BYTE = re.compile(r"^[0-9A-F]{1,2}$")
 
 
 def decompress_payload(compressed_payload: str) -> str:
@@ -101,7 +103,7 @@ def decompress_payload(compressed_payload: str) -> str:
                      is_field = True
                 elif next_m0 in ('o', 'm'):
                      is_field = True
-                elif re.match(r"^[0-9A-F]{1,2}$", next_m1.upper()):
+                elif _HEX_BYTE.match(next_m1.upper()):
                      # Matches Xyy format (e.g. F64)
                      is_field = True
                 elif next_m0.isalnum() and '=' in next_part: # R=..., C=...
@@ -173,7 +175,7 @@ def decompress_payload(compressed_payload: str) -> str:
             decompressed_parts.append(f"{m0}{m1}")
 
         # --- Hex to Dec conversion for 1 or 2 Hex Digits (Perl line 1842) ---
-        elif m1 and re.match(r"^[0-9A-F]{1,2}$", m1.upper()):
+        elif m1 and _HEX_BYTE.match(m1.upper()):
              decompressed_parts.append(f"{m0}={int(m1, 16)}")
 
         # --- Other fields (R=, B=, t=, etc. - Perl line 1845) ---
@@ -195,8 +197,14 @@ def extract_payload(line: str) -> Optional[str]:
     if not line:
         return None
         
-    line_stripped = line.strip()
-    match = _STX_ETX.match(line_stripped)
+    # Kommandoantworten (V, XQ, C..., ...) haben kein STX: ohne Regex verwerfen.
+    # Der Transport liefert die Zeile meist schon ohne Whitespace, daher wird
+    # links nur gestrippt, wenn STX nicht direkt am Anfang steht.
+    if line[:1] != "\x02":
+        line = line.lstrip()
+        if line[:1] != "\x02":
+            return None
+    match = _STX_ETX.match(line.rstrip())
     
     if not match:
         return None
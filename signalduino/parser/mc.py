@@ -13,6 +13,10 @@ from ..exceptions import SignalduinoParserError
 from ..types import DecodedMessage, RawFrame
 from .base import calc_afc, calc_rssi, ensure_message_type
 
+_HEX_DATA = re.compile(r"[0-9a-fA-F]+")
+_FIELD_KEY = re.compile(r"[A-Z]{1,2}")
+_FIELD_VALUE = re.compile(r"[-+]?[0-9a-fA-F]+")
+
 
 class MCParser:
     """
@@ -62,7 +66,7 @@ class MCParser:
         msg_data["messagetype"] = msg_data.get("M", "MC")  # M or MC from header M[cC]
 
         raw_hex = msg_data["raw_hex"]
-        if not re.fullmatch(r"[0-9a-fA-F]+", raw_hex):
+        if not _HEX_DATA.fullmatch(raw_hex):
             self.logger.warning("Ignoring MC message with non-hexadecimal raw_hex: %s", raw_hex)
             return
             
@@ -109,13 +113,13 @@ class MCParser:
                 key, value = parts_kv
                     
                 # Basic validation of key content: keys are uppercase, 1-2 chars
-                if not re.fullmatch(r"[A-Z]{1,2}", key):
+                if not _FIELD_KEY.fullmatch(key):
                      raise SignalduinoParserError(f"Invalid key in message: {key}")
                 
                 # Basic validation of value content: allow numbers, signs, and A-F for hex values
                 # This is a heuristic to catch special chars like '{' or ':' in values where they shouldn't be
                 # We are conservative and allow number/hex/sign
-                if not re.fullmatch(r"[-+]?[0-9a-fA-F]+", value):
+                if not _FIELD_VALUE.fullmatch(value):
                     raise SignalduinoParserError(f"Invalid value in message: {value}")
 
                 # Check for duplicate key (Perl-like check for corruption)
@@ -16,6 +16,9 @@ from .base import ensure_message_type, calc_rssi
 # Supports optional Y prefix in data, and optional R/A fields
 MN_PATTERN = re.compile(r"^MN;D=(Y?)([0-9A-F]+);(?:R=([0-9]+);)?(?:A=(-?[0-9]{1,3});)?$")
 
+# AFC-Schrittweite in kHz: FXOSC (26 MHz) / 2^14, einmal beim Import berechnet.
+_AFC_STEP_KHZ = 26000000 / 16384 / 1000
+
 
 class MNParser:
     """
@@ -27,6 +30,8 @@ class MNParser:
         self.protocols = protocols
         self.logger = logger
         self.rfmode = rfmode
+        # IDs der MN-Protokolle; wird beim ersten MN-Frame einmal ermittelt statt pro Zeile
+        self._mn_ids: list[str] | None = None
 
     def parse(self, frame: RawFrame) -> Iterable[DecodedMessage]:
         """Processes a raw MN frame."""
@@ -63,7 +68,7 @@ class MNParser:
                 # AFC calculation formula from Perl:
                 # round((26000000 / 16384 * freqafc / 1000), 0)
                 raw_afc = int(match.group(4))
-                freq_afc = round((26000000 / 16384 * raw_afc / 1000), 0)
+                freq_afc = round(raw_afc * _AFC_STEP_KHZ, 0)
             except ValueError:
                 pass
 
@@ -77,7 +82,9 @@ class MNParser:
         }
 
         # Iterate over all MN protocols (those having 'modulation' property)
-        mn_ids = self.protocols.get_keys('modulation')
+        mn_ids = self._mn_ids
+        if mn_ids is None:
+            mn_ids = self._mn_ids = self.protocols.get_keys('modulation')
         
         for pid in mn_ids:
             # 1. Check rfmode
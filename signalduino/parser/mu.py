@@ -12,6 +12,20 @@ from ..exceptions import SignalduinoParserError
 from ..types import DecodedMessage, RawFrame
 from .base import calc_afc, calc_rssi, ensure_message_type
 
+# Regex to validate MU messages, ported from Perl:
+# ^(?=.*D=\d+)(?:MU;(?:P[0-7]=-?[0-9]{1,5};){2,8}((?:D=\d{2,};)|(?:CP=\d;)|(?:R=\d+;)?|(?:O;)?|(?:e;)?|(?:p;)?|(?:w=\d;)?)*)$
+# Note: The Perl regex allows 'R=' with optional value? No, 'R=\d+;'.
+# The Perl regex groups are:
+# ((?:D=\d{2,};)|(?:CP=\d;)|(?:R=\d+;)?|(?:O;)?|(?:e;)?|(?:p;)?|(?:w=\d;)?)*
+# Wait, (?:R=\d+;)? means R=123; is optional match, but if present must match R=\d+;
+# But if it matches empty string? The outer loop * repeats.
+# So essentially it allows empty strings between semicolons?
+# Let's use the exact logic:
+# It ensures that AFTER the P patterns, ONLY the specified keys appear.
+MU_PATTERN = re.compile(
+    r"^(?=.*D=\d+)(?:MU;(?:P[0-7]=-?[0-9]{1,5};){2,8}((?:D=\d{2,};)|(?:CP=\d;)|(?:R=\d+;)|(?:O;)|(?:e;)|(?:p;)|(?:w=\d;))*)$"
+)
+
 
 class MUParser:
     """
@@ -34,20 +48,8 @@ class MUParser:
             self.logger.debug("Not an MU message: %s", e)
             return
 
-        # Regex check for validity (ported from Perl)
-        # ^(?=.*D=\d+)(?:MU;(?:P[0-7]=-?[0-9]{1,5};){2,8}((?:D=\d{2,};)|(?:CP=\d;)|(?:R=\d+;)?|(?:O;)?|(?:e;)?|(?:p;)?|(?:w=\d;)?)*)$
-        # Note: The Perl regex allows 'R=' with optional value? No, 'R=\d+;'.
-        # The Perl regex groups are:
-        # ((?:D=\d{2,};)|(?:CP=\d;)|(?:R=\d+;)?|(?:O;)?|(?:e;)?|(?:p;)?|(?:w=\d;)?)*
-        # Wait, (?:R=\d+;)? means R=123; is optional match, but if present must match R=\d+;
-        # But if it matches empty string? The outer loop * repeats.
-        # So essentially it allows empty strings between semicolons?
-        # Let's use the exact logic:
-        # It ensures that AFTER the P patterns, ONLY the specified keys appear.
-        
-        regex = r"^(?=.*D=\d+)(?:MU;(?:P[0-7]=-?[0-9]{1,5};){2,8}((?:D=\d{2,};)|(?:CP=\d;)|(?:R=\d+;)|(?:O;)|(?:e;)|(?:p;)|(?:w=\d;))*)$"
-        
-        if not re.match(regex, frame.line):
+        # Regex check for validity (ported from Perl), see MU_PATTERN
+        if not MU_PATTERN.match(frame.line):
              self.logger.debug("MU message failed regex validation: %s", frame.line)
              return
 
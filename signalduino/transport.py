@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import socket
 from socket import gaierror
-from typing import Optional, Any
+from typing import Optional, Any, Sequence
 import asyncio # NEU: Für asynchrone I/O und Kontextmanager
 
 from .exceptions import SignalduinoConnectionError
@@ -30,8 +30,13 @@ class BaseTransport:
     async def write_line(self, data: str) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
+    async def write_lines(self, lines: Sequence[str]) -> None:
+        """Write several lines in order; transports may override this with a single write."""
+        for line in lines:
+            await self.write_line(line)
+
     async def readline(self) -> Optional[str]:  # pragma: no cover - interface
-        # Wir entfernen das Timeout-Argument, da wir dies mit asyncio.wait_for im Controller handhaben
+        # Kein Timeout-Argument: Timeouts werden im Controller gehandhabt
         raise NotImplementedError
     
     def closed(self) -> bool:  # pragma: no cover - interface
@@ -86,7 +91,7 @@ class TCPTransport(BaseTransport):
 
     async def open(self) -> None:
         try:
-            # Das `read_timeout` wird im Controller mit `asyncio.wait_for` gehandhabt
+            # Das `read_timeout` wird im Controller gehandhabt
             self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
             logger.info("TCPTransport connected to %s:%s", self.host, self.port)
         except (OSError, gaierror) as exc:
@@ -110,6 +115,14 @@ class TCPTransport(BaseTransport):
         self._writer.write(payload)
         await self._writer.drain()
 
+    async def write_lines(self, lines: Sequence[str]) -> None:
+        if not self._writer:
+            raise SignalduinoConnectionError("TCPTransport is not open")
+        # Ein einziger write()/drain() für den ganzen Block statt einem pro Kommando
+        payload = "".join(line + "\n" for line in lines).encode("latin-1", errors="ignore")
+        self._writer.write(payload)
+        await self._writer.drain()
+
     async def readline(self) -> Optional[str]:
         if not self._reader:
             raise SignalduinoConnectionError("TCPTransport is not open")
@@ -119,8 +132,9 @@ class TCPTransport(BaseTransport):
             if not raw:
                 # Verbindung geschlossen (EOF erreicht)
                 raise SignalduinoConnectionError("Remote closed connection")
-            # Wir verwenden strip(), um das Zeilenende zu entfernen, da der Controller dies erwartet
-            return raw.decode("latin-1", errors="ignore").strip()
+            # Zeilenende (ASCII-Whitespace) noch auf den Bytes entfernen: so entsteht
+            # pro Zeile nur ein einziger str statt decode() + strip().
+            return raw.strip().decode("latin-1", errors="ignore")
         except ConnectionResetError as exc:
              raise SignalduinoConnectionError("Connection reset by peer") from exc
         except Exception as exc:
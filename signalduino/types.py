@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Callable, Optional, Pattern, Awaitable, Any
-# threading.Event wird im asynchronen Controller ersetzt
-# von asyncio.Event, das dort erstellt werden muss.
+# Antworten werden im asynchronen Controller über ein asyncio.Future signalisiert,
+# das dort (im laufenden Event-Loop) erstellt werden muss.
 
 
 @dataclass(slots=True)
@@ -41,7 +42,7 @@ class QueuedCommand:
     response_pattern: Optional[Pattern[str]] = None
     on_response: Optional[Callable[[str], None]] = None
     description: str = ""
-    inserted_at: datetime = field(default_factory=datetime.utcnow)
+    inserted_at: float = field(default_factory=time.monotonic)  # gleiche Uhr wie loop.time()
 
 
 @dataclass(slots=True)
@@ -49,13 +50,6 @@ class PendingResponse:
     """Tracks the state of a command that is waiting for a response."""
 
     command: QueuedCommand
-    deadline: datetime
-    event: asyncio.Event
-    future: asyncio.Future
-    response_pattern: Optional[Pattern[str]] = None
-    payload: str = ""
+    deadline: float  # loop.time()-basiert
+    future: asyncio.Future  # einziges Signal für die Antwort, kein zusätzliches Event
     response: Optional[str] = None
-
-    def __post_init__(self):
-        self.payload = self.command.payload
-        self.response_pattern = self.command.response_pattern
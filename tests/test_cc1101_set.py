@@ -31,11 +31,11 @@ def mock_commands(request):
 async def test_set_frequency(mock_commands):
     """Testet, dass set_frequency die korrekten drei W-Befehle sendet."""
     
-    # 433.92 MHz: F_REG = 433.92 * 2560 = 1110835.2 -> 0x10F073 (gerundet: 1110835)
+    # 433.92 MHz: F_REG = 433.92 * 2^16 / 26 = 1093745.03 -> 0x10B071 (abgeschnitten: 1093745)
     freq_mhz = 433.92
-    f_reg = 1110835 
+    f_reg = 1093745 
     
-    # Registerwerte für 0x10, 0xF0, 0x73
+    # Registerwerte für 0x10, 0xB0, 0x71
     freq2 = (f_reg >> 16) & 0xFF
     freq1 = (f_reg >> 8) & 0xFF
     freq0 = f_reg & 0xFF
@@ -165,4 +165,110 @@ async def test_set_bwidth_special_case(mock_commands):
     await mock_commands.set_bwidth(bwidth)
 
     mock_commands._send_command.assert_awaited_with(command=expected_command, expect_response=False)
-    mock_commands.cc1101_write_init.assert_awaited_once()
\ No newline at end of file
+    mock_commands.cc1101_write_init.assert_awaited_once()
+
+@pytest.mark.parametrize("datarate_kbaud, expected", [
+    (0.6, (4, 131)),
+    (4.8, (7, 131)),
+    (9.6, (8, 131)),
+    (17.24, (9, 92)),
+    (38.4, (10, 131)),
+    (100, (11, 248)),
+    (500, (14, 59)),
+])
+def test_calculate_datarate_registers(mock_commands, datarate_kbaud, expected):
+    """Testet die DRATE_E/DRATE_M-Berechnung gegen bekannte CC1101-Werte."""
+    assert mock_commands._calculate_datarate_registers(datarate_kbaud) == expected
+
+
+def test_calculate_datarate_registers_exponent_boundary(mock_commands):
+    """Zwischen (256 + 255) * 2^E und 256 * 2^(E+1) wird der nächstliegende Wert gewählt."""
+    assert mock_commands._calculate_datarate_registers(406.1) == (14, 0)
+
+
+def test_calculate_datarate_registers_out_of_range(mock_commands):
+    """Nicht einstellbare Datenraten liefern (0, 0)."""
+    assert mock_commands._calculate_datarate_registers(0.01) == (0, 0)
+    assert mock_commands._calculate_datarate_registers(2000) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_get_bandwidth(mock_commands):
+    """MDMCFG4=0xD0 -> CHANBW_E=3, CHANBW_M=1 -> 26000 / (8 * 5 * 8) = 81.25 kHz."""
+    assert await mock_commands.get_bandwidth() == {"bandwidth": 81.25}
+
+
+@pytest.mark.parametrize("deviation_khz, expected", [
+    (1.586914, 0x00),
+    (20.629883, 0x35),  # (8 + 5) * 2^3 * 26000 / 2^17
+    (47.607422, 0x47),  # CC1101 Reset-Wert
+    (50.0, 0x50),
+    (380.859375, 0x77),
+])
+def test_calculate_deviation_register(mock_commands, deviation_khz, expected):
+    """Testet die DEVIATN-Berechnung (E in Bits 6:4, M in Bits 2:0)."""
+    assert mock_commands._calculate_deviation_register(deviation_khz) == expected
+
+
+@pytest.mark.asyncio
+async def test_set_deviation(mock_commands):
+    """Testet, dass set_deviation den W17-Befehl sendet und die CC1101 neu initialisiert."""
+    mock_commands.cc1101_write_init = AsyncMock()
+
+    await mock_commands.set_deviation(47.607422)
+
+    mock_commands._send_command.assert_called_once_with(command="W1747", expect_response=False)
+    mock_commands.cc1101_write_init.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rampl_tables(mock_commands):
+    """get_rampl liest den dB-Wert per Index, set_rampl ignoriert unbekannte Werte."""
+    mock_commands._read_register_value = AsyncMock(return_value=0x47)
+    assert await mock_commands.get_rampl() == {"rampl": 42}
+
+    mock_commands.cc1101_write_init = AsyncMock()
+    await mock_commands.set_rampl(25)
+    mock_commands._send_command.assert_not_called()
+    await mock_commands.set_rampl(38)
+    mock_commands._send_command.assert_called_once_with(command="W1D05", expect_response=False)
+
+
+@pytest.mark.asyncio
+async def test_read_register_value_parses_response():
+    """_read_register_value extrahiert den Hexwert aus 'Cxx = yy' und lehnt andere Antworten ab."""
+    commands = SignalduinoCommands(AsyncMock())
+    commands._read_cc1101_register_by_address = AsyncMock(return_value={"register_value": "C10 = 57"})
+    assert await commands._read_register_value(0x10) == 0x57
+
+    commands._read_cc1101_register_by_address = AsyncMock(return_value={"register_value": "ccreg 10: 57"})
+    with pytest.raises(ValueError):
+        await commands._read_register_value(0x10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sens_value", [0, 2, 20, 40])
+async def test_set_sensitivity_rejects_out_of_range(mock_commands, sens_value):
+    """Werte außerhalb von 4..16 dB würden die 9<idx>-Kodierung sprengen und werden nicht gesendet."""
+    mock_commands.cc1101_write_init = AsyncMock()
+
+    await mock_commands.set_sens(sens_value)
+
+    mock_commands._send_command.assert_not_awaited()
+    mock_commands.cc1101_write_init.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("freq_mhz", [433.92, 868.35])
+async def test_set_frequency_round_trips_through_get_frequency(mock_commands, freq_mhz):
+    """Die von set_frequency geschriebenen Register ergeben beim Lesen wieder die Frequenz."""
+    mock_commands.cc1101_write_init = AsyncMock()
+    await mock_commands.set_frequency(freq_mhz)
+
+    written = [c.kwargs["command"] for c in mock_commands._send_command.call_args_list[:3]]
+    f_reg = int("".join(cmd[3:] for cmd in written), 16)
+    mock_commands._get_frequency_registers = AsyncMock(return_value=f_reg)
+
+    result = await mock_commands.get_frequency()
+    # Abweichung höchstens ein Registerschritt (26 MHz / 2^16 ≈ 397 Hz)
+    assert abs(result["frequency"] - freq_mhz) < 26.0 / 65536
@@ -1,13 +1,15 @@
 import asyncio
+import logging
 from asyncio import Queue
 from unittest.mock import MagicMock, Mock, AsyncMock, patch
 
 import pytest
 
+from signalduino.constants import SDUINO_INIT_MAXRETRY
 from signalduino.controller import SignalduinoController
-from signalduino.exceptions import SignalduinoCommandTimeout
+from signalduino.exceptions import SignalduinoCommandTimeout, SignalduinoConnectionError
 from signalduino.transport import BaseTransport
-from signalduino.types import DecodedMessage, RawFrame
+from signalduino.types import DecodedMessage, QueuedCommand, RawFrame
 
 
 @pytest.fixture
@@ -65,6 +67,7 @@ def mock_parser():
     """Fixture for a mocked parser."""
     parser = MagicMock()
     parser.parse_line.return_value = []
+    parser.parse_lines.side_effect = lambda lines: [parser.parse_line(line) for line in lines]
     return parser
 
 
@@ -134,6 +137,39 @@ async def test_send_command_fire_and_forget(mock_transport, mock_parser, mock_co
         # The controller's __aexit__ will handle task cleanup.
 
 
+@pytest.mark.asyncio
+async def test_writer_drains_queued_commands_in_order(mock_transport, mock_parser):
+    """Commands queued before the writer wakes up are written as one FIFO batch."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    for payload in ("XQ", "V", "XE"):
+        controller._write_queue.put_nowait(QueuedCommand(payload=payload, timeout=1.0))
+
+    writer = asyncio.create_task(controller._writer_task())
+    await asyncio.wait_for(controller._write_queue.join(), timeout=1.0)
+    writer.cancel()
+    await asyncio.gather(writer, return_exceptions=True)
+
+    mock_transport.write_lines.assert_awaited_once_with(["XQ", "V", "XE"])
+    mock_transport.write_line.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_register_writes_reach_transport_as_one_batch(mock_transport, mock_parser):
+    """Fire-and-forget register writes queue without yielding, so the writer sends them in one go."""
+    mock_transport.closed.return_value = False
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+
+    await controller.commands.set_frequency(433.92)
+    writer = asyncio.create_task(controller._writer_task())
+    await asyncio.wait_for(controller._write_queue.join(), timeout=1.0)
+    writer.cancel()
+    await asyncio.gather(writer, return_exceptions=True)
+
+    mock_transport.write_lines.assert_awaited_once_with(
+        ["W0D10", "W0EB0", "W0F71", "WS36", "WS3A", "WS34"]
+    )
+
+
 @pytest.mark.asyncio
 async def test_send_command_with_response(mock_transport, mock_parser, mock_controller_initialize):
     """Test sending a command and waiting for a response."""
@@ -190,6 +226,64 @@ async def test_send_command_timeout(mock_transport, mock_parser, mock_controller
             await controller.send_command("V", expect_response=True, timeout=0.1)
 
 
+@pytest.mark.asyncio
+async def test_pending_responses_are_removed_by_tag(mock_transport, mock_parser, mock_controller_initialize):
+    """Matched and timed-out commands leave no entry in _pending_responses."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    async with controller:
+        ram_task = asyncio.create_task(controller._send_and_wait("R", timeout=10.0))
+        version_task = asyncio.create_task(controller._send_and_wait("V", timeout=10.0))
+        await asyncio.sleep(0)
+        assert len(controller._pending_responses) == 2
+
+        controller._handle_as_command_response("V 3.5.0-dev SIGNALduino")
+        assert await version_task == "V 3.5.0-dev SIGNALduino"
+        assert [p.command.payload for p in controller._pending_responses.values()] == ["R"]
+
+        ram_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await ram_task
+        assert controller._pending_responses == {}
+
+        with pytest.raises(SignalduinoCommandTimeout):
+            await controller._send_and_wait("t", timeout=0.05)
+        assert controller._pending_responses == {}
+        assert controller._pending_by_payload == {}
+        assert controller._pending_patterns == {}
+
+
+def test_command_response_check_skips_matching_without_pending(mock_transport, mock_parser):
+    """RF lines are not matched against anything while no command is waiting."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    with patch.object(controller, "_match_pending") as match_pending:
+        controller._handle_as_command_response("MS;P0=1;D=01;")
+    match_pending.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_response_goes_to_oldest_matching_pending(mock_transport, mock_parser):
+    """Prefix and regex candidates are resolved in registration order."""
+    import re
+
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    controller._write_queue = AsyncMock()
+    numeric = re.compile(r"^(\d+)$")
+
+    ram = asyncio.create_task(controller._send_and_wait("R", timeout=1.0, response_pattern=numeric))
+    uptime = asyncio.create_task(controller._send_and_wait("t", timeout=1.0, response_pattern=numeric))
+    version = asyncio.create_task(controller._send_and_wait("V", timeout=1.0))
+    await asyncio.sleep(0)
+
+    controller._handle_as_command_response("V 3.5.0")
+    controller._handle_as_command_response("1234")
+    controller._handle_as_command_response("99")
+
+    assert await version == "V 3.5.0"
+    assert await ram == "1234"
+    assert await uptime == "99"
+    assert controller._pending_responses == {}
+
+
 @pytest.mark.asyncio
 async def test_message_callback(mock_transport, mock_parser, mock_controller_initialize):
     """Test message callback invocation."""
@@ -273,4 +367,281 @@ async def test_stx_message_bypasses_command_response(mock_transport, mock_parser
         # The STX message is stripped and passed to the parser
         mock_parser.parse_line.assert_any_call(stx_msg)
         # The command response is also passed to the parser
-        mock_parser.parse_line.assert_any_call(response)
\ No newline at end of file
+        mock_parser.parse_line.assert_any_call(response)
+
+@pytest.mark.asyncio
+async def test_heartbeat_timer_rearms_and_stops(mock_transport, mock_parser, mock_controller_initialize):
+    """The heartbeat re-arms itself via call_later and is cancelled on exit."""
+    publisher = MagicMock()
+    publisher.publish_simple = AsyncMock()
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser, mqtt_publisher=publisher)
+
+    with patch("signalduino.controller.SDUINO_STATUS_HEARTBEAT_INTERVAL", 0.01):
+        async with controller:
+            await controller._start_heartbeat_task()
+            await asyncio.sleep(0.05)
+            assert controller._heartbeat_handle is not None
+
+    assert controller._heartbeat_handle is None
+    assert publisher.publish_simple.await_count >= 2
+    assert publisher.publish_simple.await_args.args[0] == "status/heartbeat"
+
+
+@pytest.mark.asyncio
+async def test_full_write_queue_counts_against_command_timeout(mock_transport, mock_parser):
+    """With the bounded write queue full, a command times out instead of waiting forever."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    assert controller._write_queue.maxsize > 0
+    while not controller._write_queue.full():
+        controller._write_queue.put_nowait(QueuedCommand(payload="X", timeout=1.0))
+
+    with pytest.raises(SignalduinoCommandTimeout):
+        await controller._send_and_wait("V", timeout=0.05)
+    assert controller._pending_responses == {}
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_skipped_while_mqtt_disconnected(mock_transport, mock_parser):
+    """The heartbeat checks the publisher's synchronous connected flag before publishing."""
+    publisher = MagicMock()
+    publisher.publish_simple = AsyncMock()
+    publisher.connected = False
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser, mqtt_publisher=publisher)
+
+    await controller._publish_status_heartbeat()
+    publisher.publish_simple.assert_not_awaited()
+
+    publisher.connected = True
+    await controller._publish_status_heartbeat()
+    publisher.publish_simple.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_heartbeat_timer(mock_transport, mock_parser):
+    """stop() disarms the heartbeat timer right away instead of at the next tick."""
+    publisher = MagicMock()
+    publisher.publish_simple = AsyncMock()
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser, mqtt_publisher=publisher)
+
+    await controller._start_heartbeat_task()
+    handle = controller._heartbeat_handle
+    assert handle is not None
+
+    controller.stop()
+    assert handle.cancelled()
+    assert controller._heartbeat_handle is None
+    # Ein erneuter Start nach stop() plant keinen Timer mehr ein
+    await controller._start_heartbeat_task()
+    assert controller._heartbeat_handle is None
+    if controller._heartbeat_task is not None:
+        await controller._heartbeat_task
+
+
+@pytest.mark.asyncio
+async def test_stop_resolves_run(mock_transport, mock_parser):
+    """stop() unblocks a pending run(); run() also honours its timeout."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    await controller.run(timeout=0.01)
+    assert not controller._stopping
+
+    runner = asyncio.create_task(controller.run())
+    await asyncio.sleep(0)
+    controller.stop()
+    await asyncio.wait_for(runner, timeout=1.0)
+    assert controller._stopping
+
+
+@pytest.mark.asyncio
+async def test_raw_queue_is_bounded_and_warns_on_backlog(mock_transport, mock_parser, caplog):
+    """The reader/parser queue is bounded and a growing backlog is logged once."""
+    from signalduino.constants import SDUINO_RAW_QUEUE_MAXSIZE
+
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    assert controller._raw_message_queue.maxsize == SDUINO_RAW_QUEUE_MAXSIZE
+
+    with caplog.at_level("WARNING"):
+        for i in range(SDUINO_RAW_QUEUE_MAXSIZE // 2 + 3):
+            controller._raw_message_queue.put_nowait(f"MS;{i}")
+            controller._check_raw_queue_backlog()
+
+    warnings = [r for r in caplog.records if "Raw message queue is filling up" in r.message]
+    assert len(warnings) == 1
+
+
+@pytest.mark.asyncio
+async def test_message_callbacks_run_concurrently_up_to_limit(mock_transport, mock_parser):
+    """Slow callbacks do not block the parser until the concurrency limit is reached."""
+    from signalduino.constants import SDUINO_CALLBACK_CONCURRENCY
+
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def slow_callback(message):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser, message_callback=slow_callback)
+    msg = DecodedMessage(protocol_id="1", payload="test", raw=RawFrame(line=""))
+
+    dispatcher = asyncio.gather(
+        *(controller._dispatch_message_callback(msg) for _ in range(SDUINO_CALLBACK_CONCURRENCY + 2))
+    )
+    await asyncio.sleep(0.01)
+    assert peak == SDUINO_CALLBACK_CONCURRENCY
+    assert not dispatcher.done()
+
+    release.set()
+    await asyncio.wait_for(dispatcher, timeout=1.0)
+    await asyncio.gather(*controller._callback_tasks)
+    assert running == 0
+
+
+@pytest.mark.asyncio
+async def test_init_retries_version_then_fails(mock_transport, mock_parser):
+    """The start-up sequence sends XQ once, retries V and unblocks waiters after the last attempt."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+
+    seen = []
+
+    async def send_command(cmd, **kwargs):
+        seen.append(cmd)
+        if cmd == "V":
+            raise SignalduinoCommandTimeout("Timeout")
+
+    controller.send_command = AsyncMock(side_effect=send_command)
+    with patch("signalduino.controller.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(SignalduinoConnectionError):
+            await controller._init_task_start_loop()
+
+    assert seen == ["XQ"] + ["V"] * SDUINO_INIT_MAXRETRY
+    assert controller.init_retry_count == SDUINO_INIT_MAXRETRY - 1
+    assert controller._init_complete_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_reader_does_not_throttle_available_lines(mock_transport, mock_parser):
+    """Lines that are already available are forwarded without a per-line pause."""
+    lines = [f"MS;{i}" for i in range(200)]
+    remaining = iter(lines)
+
+    async def readline():
+        try:
+            return next(remaining)
+        except StopIteration:
+            await asyncio.Future()
+
+    mock_transport.readline.side_effect = readline
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    reader = asyncio.create_task(controller._reader_task())
+    try:
+        # Mit 10 ms Pause pro Zeile bräuchte das mindestens 2 Sekunden
+        for _ in range(50):
+            if controller._raw_message_queue.qsize() == len(lines):
+                break
+            await asyncio.sleep(0.01)
+        assert controller._raw_message_queue.qsize() == len(lines)
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_parser_handles_queued_lines_in_one_batch(mock_transport, mock_parser):
+    """Lines already waiting in the raw queue are parsed with a single thread hop, in order."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    lines = [f"MS;{i}" for i in range(5)]
+    for line in lines:
+        controller._raw_message_queue.put_nowait(line)
+
+    with patch("signalduino.controller.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        parser = asyncio.create_task(controller._parser_task())
+        try:
+            for _ in range(50):
+                if mock_parser.parse_line.call_count == len(lines):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            controller.stop()
+            parser.cancel()
+            await asyncio.gather(parser, return_exceptions=True)
+
+    assert [c.args[0] for c in mock_parser.parse_line.call_args_list] == lines
+    assert to_thread.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_message_callback_is_called_without_task(mock_transport, mock_parser, caplog):
+    """Plain functions are called inline; lambdas returning a coroutine still get awaited."""
+    msg = DecodedMessage(protocol_id="1", payload="test", raw=RawFrame(line=""))
+    received = []
+
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser, message_callback=received.append)
+    with caplog.at_level(logging.ERROR):
+        await controller._dispatch_message_callback(msg)
+    assert received == [msg]
+    assert not controller._callback_tasks
+    assert "Message callback error" not in caplog.text
+
+    async def async_callback(message):
+        received.append(message.payload)
+
+    controller.message_callback = lambda message: async_callback(message)
+    await controller._dispatch_message_callback(msg)
+    await asyncio.gather(*controller._callback_tasks)
+    assert received == [msg, "test"]
+
+
+def test_signal_parser_parse_lines_keeps_per_line_results():
+    """parse_lines liefert je Eingabezeile genau einen Eintrag, in derselben Reihenfolge."""
+    from signalduino.parser import SignalParser
+
+    parser = SignalParser()
+    decoded = DecodedMessage(protocol_id="1", payload="test", raw=RawFrame(line=""))
+    with patch.object(parser, "parse_line", side_effect=lambda line: [decoded] if line == "b" else []) as parse_line:
+        assert parser.parse_lines(["a", "b", "c"]) == [[], [decoded], []]
+    assert [c.args[0] for c in parse_line.call_args_list] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_aexit_fails_pending_commands_immediately(mock_transport, mock_parser):
+    """Shutdown releases waiting send_command() calls instead of letting them run into their timeout."""
+    controller = SignalduinoController(transport=mock_transport, parser=mock_parser)
+    mock_transport.closed.return_value = False
+
+    waiter = asyncio.create_task(controller.send_command("V", expect_response=True, timeout=30))
+    await asyncio.sleep(0)
+    assert controller._pending_responses
+
+    await controller.__aexit__(None, None, None)
+
+    with pytest.raises(SignalduinoConnectionError, match="shutting down"):
+        await asyncio.wait_for(waiter, timeout=1.0)
+    assert controller._pending_responses == {}
+
+
+@pytest.mark.asyncio
+async def test_parser_task_falls_back_to_parse_line(mock_transport):
+    """Ein Parser ohne parse_lines wird zeilenweise über parse_line aufgerufen."""
+    decoded = DecodedMessage(protocol_id="1", payload="ABC", raw=RawFrame(line="MS;"))
+
+    class LineParser:
+        def parse_line(self, line):
+            return [decoded] if line.startswith("MS") else []
+
+    received = []
+    controller = SignalduinoController(
+        transport=mock_transport, parser=LineParser(), message_callback=received.append
+    )
+    parser_task = asyncio.create_task(controller._parser_task())
+    for line in ("MS;P0=1;D=01;", "MU;P0=1;D=01;", "MS;P0=2;D=02;"):
+        controller._raw_message_queue.put_nowait(line)
+    await asyncio.sleep(0.05)
+
+    controller.stop()
+    parser_task.cancel()
+    await asyncio.gather(parser_task, return_exceptions=True)
+    assert received == [decoded, decoded]
@@ -1,6 +1,6 @@
 import re
 from typing import List, Tuple, Dict
-from signalduino.parser.base import decompress_payload
+from signalduino.parser.base import decompress_payload, extract_payload
 
 # Testdaten basierend auf temp_repo/t/FHEM/00_SIGNALduino/02_sub_SIGNALduino_Read.t
 # Die Rohdaten müssen von Hex-String in einen String aus Latin-1-Zeichen umgewandelt werden, 
@@ -76,5 +76,18 @@ def test_decompress_payload():
 
     print("All decompress_payload tests passed successfully.")
 
+
+def test_extract_payload_requires_stx():
+    """Zeilen ohne STX (z.B. Kommandoantworten) liefern None, gerahmte Nachrichten den Payload."""
+    assert extract_payload("V 3.5.7+20250219 SIGNALduino cc1101") is None
+    assert extract_payload("MS;P0=1;D=01;") is None
+    assert extract_payload("\x02MS;P0=1;D=01;\x03\r\n") == "MS;P0=1;D=01;"
+
+
+def test_extract_payload_tolerates_surrounding_whitespace():
+    """Führender und abschließender Whitespace um STX/ETX wird weiterhin ignoriert."""
+    assert extract_payload("  \x02MU;P0=1;D=01;\x03 \n") == "MU;P0=1;D=01;"
+
+
 if __name__ == "__main__":
-    test_decompress_payload()
\ No newline at end of file
+    test_decompress_payload()
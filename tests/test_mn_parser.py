@@ -1,5 +1,5 @@
 import logging
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -206,4 +206,12 @@ def test_mn_parser_messages_perl_migration(
         
         # Verify freq_afc if expected
         if expected_freq_afc is not None:
-            assert result[0].metadata["freq_afc"] == expected_freq_afc
\ No newline at end of file
+            assert result[0].metadata["freq_afc"] == expected_freq_afc
+
+def test_mn_protocol_ids_are_looked_up_once(mn_parser_factory, proto):
+    """Die Liste der MN-Protokolle wird nur beim ersten Frame aus SDProtocols ermittelt."""
+    parser = mn_parser_factory()
+    with patch.object(proto, "get_keys", wraps=proto.get_keys) as get_keys:
+        list(parser.parse(RawFrame(line="MN;D=DA5A2866AAA290AAAAAA;R=23;A=-2;")))
+        list(parser.parse(RawFrame(line="MN;D=DA5A2866AAA290AAAAAA;R=23;A=-2;")))
+    get_keys.assert_called_once_with('modulation')
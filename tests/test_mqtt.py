@@ -10,6 +10,7 @@ from aiomqtt import Client as AsyncMqttClient
 from aiomqtt.message import Message # Korrekter Import
 
 from signalduino.mqtt import MqttPublisher
+from signalduino.exceptions import CommandValidationError
 from signalduino.types import DecodedMessage, RawFrame
 from signalduino.transport import BaseTransport
 from signalduino.controller import SignalduinoController
@@ -141,6 +142,103 @@ async def test_mqtt_publisher_publish_success(MockClient, mock_decoded_message,
     assert "Published message for protocol 1 to test/signalduino/v1/state/messages" in caplog.text
 
 
+@patch("signalduino.mqtt.mqtt.Client")
+@pytest.mark.asyncio
+async def test_mqtt_publisher_flushes_queued_messages_in_order(MockClient, mock_controller):
+    """Testet, dass gebündelte publish()-Aufrufe vollständig und in Reihenfolge veröffentlicht werden."""
+    mock_client_instance = MockClient.return_value
+    mock_client_instance.publish = AsyncMock()
+    mock_client_instance.subscribe = AsyncMock()
+    MockClient.return_value.__aenter__ = AsyncMock(return_value=None)
+    MockClient.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    publisher = MqttPublisher(mock_controller)
+    messages = [
+        DecodedMessage(protocol_id=str(i), payload=f"P{i}", raw=RawFrame(line=""))
+        for i in range(5)
+    ]
+
+    async with publisher:
+        for message in messages:
+            await publisher.publish(message)
+        # publish() stellt nur in die Queue, veröffentlicht wird vom Flusher
+        assert publisher._publish_queue.qsize() == 5
+
+    published = [json.loads(c.args[1])["protocol_id"] for c in mock_client_instance.publish.call_args_list]
+    assert published == ["0", "1", "2", "3", "4"]
+
+
+@patch("signalduino.mqtt.SDUINO_MQTT_PUBLISH_QUEUE_MAXSIZE", 4)
+@patch("signalduino.mqtt.mqtt.Client")
+@pytest.mark.asyncio
+async def test_mqtt_publisher_queue_is_bounded_while_broker_stalls(MockClient, mock_controller):
+    """Hängt der Broker, wartet publish() bei voller Queue, statt unbegrenzt zu puffern."""
+    broker_released = asyncio.Event()
+
+    async def stalled_publish(*args, **kwargs):
+        await broker_released.wait()
+
+    mock_client_instance = MockClient.return_value
+    mock_client_instance.publish = AsyncMock(side_effect=stalled_publish)
+    mock_client_instance.subscribe = AsyncMock()
+    MockClient.return_value.__aenter__ = AsyncMock(return_value=None)
+    MockClient.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    publisher = MqttPublisher(mock_controller)
+    messages = [
+        DecodedMessage(protocol_id=str(i), payload=f"P{i}", raw=RawFrame(line=""))
+        for i in range(10)
+    ]
+
+    async with publisher:
+        # Die erste Nachricht holt der Flusher ab und bleibt im Broker hängen
+        await publisher.publish(messages[0])
+        await asyncio.sleep(0)
+        producer = asyncio.create_task(publisher.publish_many(messages[1:]))
+        await asyncio.sleep(0.05)
+        assert not producer.done()
+        assert publisher._publish_queue.qsize() == 4
+
+        broker_released.set()
+        await asyncio.wait_for(producer, timeout=1)
+
+    published = [json.loads(c.args[1])["protocol_id"] for c in mock_client_instance.publish.call_args_list]
+    assert published == [str(i) for i in range(10)]
+
+
+def test_message_to_json_matches_asdict_format():
+    """Die Serialisierung entspricht der bisherigen asdict()-Ausgabe ohne raw."""
+    message = DecodedMessage(
+        protocol_id="7", payload="ABC", raw=RawFrame(line="MS;"), metadata={"rssi": -70}
+    )
+    expected = json.dumps({"protocol_id": "7", "payload": "ABC", "metadata": {"rssi": -70}}, indent=4)
+    assert MqttPublisher._message_to_json(message) == expected
+
+
+@patch("signalduino.mqtt.mqtt.Client")
+@pytest.mark.asyncio
+async def test_mqtt_publisher_publish_many(MockClient, mock_controller):
+    """Testet publish_many(): Alle Nachrichten landen in Reihenfolge in einem Aufruf in der Queue."""
+    mock_client_instance = MockClient.return_value
+    mock_client_instance.publish = AsyncMock()
+    mock_client_instance.subscribe = AsyncMock()
+    MockClient.return_value.__aenter__ = AsyncMock(return_value=None)
+    MockClient.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    publisher = MqttPublisher(mock_controller)
+    messages = [
+        DecodedMessage(protocol_id=str(i), payload=f"P{i}", raw=RawFrame(line=""))
+        for i in range(3)
+    ]
+
+    async with publisher:
+        await publisher.publish_many(messages)
+        assert publisher._publish_queue.qsize() == 3
+
+    published = [json.loads(c.args[1])["protocol_id"] for c in mock_client_instance.publish.call_args_list]
+    assert published == ["0", "1", "2"]
+
+
 @patch("signalduino.mqtt.mqtt.Client")
 @pytest.mark.asyncio
 async def test_mqtt_publisher_publish_simple(MockClient, caplog, mock_controller):
@@ -175,6 +273,35 @@ async def test_mqtt_publisher_publish_simple(MockClient, caplog, mock_controller
     assert "Published simple message to test/signalduino/v1/status: online" in caplog.text
 
 
+@patch("signalduino.mqtt.mqtt.Client")
+@pytest.mark.asyncio
+async def test_mqtt_command_listener_does_not_throttle_messages(MockClient, mock_controller):
+    """Schnell aufeinanderfolgende Befehle werden ohne feste Pause pro Nachricht verarbeitet."""
+    mock_client_instance = MockClient.return_value
+    mock_client_instance.subscribe = AsyncMock()
+    mock_client_instance.messages = MagicMock()
+    MockClient.return_value.__aenter__ = AsyncMock(return_value=None)
+    MockClient.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    async def mock_messages_generator():
+        for i in range(100):
+            msg = Mock(spec=Message)
+            msg.topic = MagicMock()
+            msg.topic.__str__.return_value = "test/signalduino/v1/commands/get/system/version"
+            msg.payload = f'{{"req_id": "{i}"}}'.encode()
+            yield msg
+
+    mock_client_instance.messages.__aiter__ = Mock(return_value=mock_messages_generator())
+    publisher = MqttPublisher(mock_controller)
+
+    with patch.object(publisher, 'publish_simple', new=AsyncMock()):
+        async with publisher:
+            # Mit 10 ms Pause pro Nachricht bräuchte das mindestens eine Sekunde
+            await asyncio.sleep(0.2)
+
+    assert mock_controller.get_version.call_count == 100
+
+
 @patch("signalduino.mqtt.mqtt.Client")
 @pytest.mark.asyncio
 async def test_mqtt_publisher_command_listener(MockClient, caplog, mock_controller):
@@ -449,6 +576,9 @@ async def test_controller_parser_loop_publishes_message(
     
     # Der Parser gibt eine DecodedMessage zurück
     mock_parser_instance.parse_line.return_value = [mock_decoded_message]
+    mock_parser_instance.parse_lines.side_effect = lambda lines: [
+        mock_parser_instance.parse_line(line) for line in lines
+    ]
     
     # Wir brauchen einen MockTransport, der eine Nachricht liefert
     mock_transport = MockTransport()
@@ -471,10 +601,133 @@ async def test_controller_parser_loop_publishes_message(
             await asyncio.sleep(0.5)
             
             # Beende den Parser-Task sauber
-            controller._stop_event.set()
+            controller.stop()
             parser_task.cancel()
             await asyncio.gather(parser_task, return_exceptions=True)
             
             # Überprüfe, ob der Publisher für die DecodedMessage aufgerufen wurde
             # Der Publish-Aufruf ist jetzt auch async
-            mock_publisher_instance.publish.assert_called_once_with(mock_decoded_message)
\ No newline at end of file
+            mock_publisher_instance.publish.assert_called_once_with(mock_decoded_message)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, expected_message", [
+    (CommandValidationError("Invalid payload"), "Invalid payload"),
+    (RuntimeError("boom"), "Internal server error during command execution."),
+])
+async def test_handle_command_publishes_errors(mock_controller, error, expected_message):
+    """Validierungs- und interne Fehler landen mit req_id unter {topic}/errors."""
+    publisher = MqttPublisher(mock_controller)
+    publisher.dispatcher.dispatch = AsyncMock(side_effect=error)
+
+    with patch.object(publisher, "publish_simple", new=AsyncMock()) as mock_publish_simple:
+        await publisher._handle_command("get/system/version", '{"req_id": "r1"}')
+
+    mock_publish_simple.assert_awaited_once_with(
+        subtopic="errors",
+        payload=json.dumps({
+            "command": "get/system/version",
+            "success": False,
+            "req_id": "r1",
+            "error": expected_message,
+        }),
+        retain=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_command_parses_payload_once(mock_controller):
+    """Der Payload wird nur einmal dekodiert; ungültiges JSON geht als Rohstring weiter."""
+    publisher = MqttPublisher(mock_controller)
+    publisher.dispatcher.dispatch = AsyncMock(return_value={"status": "OK", "req_id": "r1", "data": "V"})
+
+    with patch.object(publisher, "publish_simple", new=AsyncMock()), \
+            patch("signalduino.mqtt.json.loads", wraps=json.loads) as mock_loads:
+        await publisher._handle_command("get/system/version", '{"req_id": "r1"}')
+        await publisher._handle_command("get/system/version", "not json")
+
+    assert mock_loads.call_count == 2
+    assert publisher.dispatcher.dispatch.await_args_list[0].args == ("get/system/version", {"req_id": "r1"})
+    assert publisher.dispatcher.dispatch.await_args_list[1].args == ("get/system/version", "not json")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload", ['""', '"{}"', '[]', '5'])
+async def test_handle_command_rejects_non_object_json(mock_controller, payload):
+    """JSON, das kein Objekt ist (z.B. ein String-Literal), wird wie bisher abgelehnt."""
+    publisher = MqttPublisher(mock_controller)
+
+    with patch.object(publisher, "publish_simple", new=AsyncMock()) as mock_publish:
+        await publisher._handle_command("get/system/version", payload)
+
+    mock_controller.get_version.assert_not_awaited()
+    mock_publish.assert_awaited_once()
+    assert mock_publish.await_args.kwargs["subtopic"] == "errors"
+    error = json.loads(mock_publish.await_args.kwargs["payload"])["error"]
+    assert "is not of type 'object'" in error
+
+
+@pytest.mark.asyncio
+async def test_publish_simple_reuses_topic_strings(mock_controller):
+    """Response-/Error-Topics sind vorberechnet, weitere Subtopics werden beim ersten Aufruf gecacht."""
+    publisher = MqttPublisher(mock_controller)
+    publisher.client = AsyncMock()
+
+    await publisher.publish_simple("responses", "{}")
+    await publisher.publish_simple("errors", "{}")
+    await publisher.publish_simple("status", "a")
+    await publisher.publish_simple("status", "b")
+
+    topics = [c.args[0] for c in publisher.client.publish.call_args_list]
+    assert topics == [
+        publisher.response_topic,
+        publisher.error_topic,
+        f"{publisher.base_topic}/status",
+        f"{publisher.base_topic}/status",
+    ]
+    assert topics[0] is publisher.response_topic
+    assert topics[2] is topics[3]
+
+
+@patch("signalduino.mqtt.mqtt.Client")
+@pytest.mark.asyncio
+async def test_mqtt_commands_run_in_arrival_order(MockClient, mock_controller):
+    """Befehle laufen nacheinander in Eingangsreihenfolge, ohne den Listener aufzuhalten."""
+    mock_client_instance = MockClient.return_value
+    mock_client_instance.subscribe = AsyncMock()
+    mock_client_instance.messages = MagicMock()
+    MockClient.return_value.__aenter__ = AsyncMock(return_value=None)
+    MockClient.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    release = asyncio.Event()
+    received = asyncio.Event()
+
+    async def slow_version(payload):
+        await release.wait()
+        return "V 3.5.0"
+
+    mock_controller.get_version = AsyncMock(side_effect=slow_version)
+    mock_controller.get_free_ram = AsyncMock(return_value=1234)
+
+    async def mock_messages_generator():
+        for command in ("get/system/version", "get/system/freeram"):
+            msg = Mock(spec=Message)
+            msg.topic = MagicMock()
+            msg.topic.__str__.return_value = f"test/signalduino/v1/commands/{command}"
+            msg.payload = b'{"req_id": "x"}'
+            yield msg
+        received.set()
+
+    mock_client_instance.messages.__aiter__ = Mock(return_value=mock_messages_generator())
+    publisher = MqttPublisher(mock_controller)
+
+    with patch.object(publisher, 'publish_simple', new=AsyncMock()):
+        async with publisher:
+            # Der Listener hat beide Befehle angenommen, obwohl der erste noch auf das Gerät wartet
+            await asyncio.wait_for(received.wait(), timeout=1)
+            await asyncio.sleep(0.05)
+            mock_controller.get_version.assert_awaited_once()
+            mock_controller.get_free_ram.assert_not_awaited()
+            release.set()
+
+    mock_controller.get_free_ram.assert_awaited_once()
+    assert publisher._command_worker_task is None
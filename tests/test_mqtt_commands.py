@@ -14,7 +14,7 @@ from signalduino.commands import MqttCommandDispatcher
 from signalduino.controller import SignalduinoController
 from signalduino.transport import BaseTransport
 from signalduino.commands import SignalduinoCommands
-from signalduino.exceptions import SignalduinoCommandTimeout
+from signalduino.exceptions import CommandValidationError, SignalduinoCommandTimeout
 from signalduino.controller import QueuedCommand # Import QueuedCommand
 from signalduino.constants import SDUINO_CMD_TIMEOUT
 
@@ -559,6 +559,72 @@ async def test_controller_handles_get_cc1101_settings(signalduino_controller, mo
         dr_mock.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_get_cc1101_settings_is_cached_until_set(signalduino_controller, mock_aiomqtt_client_cls):
+    """
+    Wiederholte 'get/cc1101/settings'-Abfragen werden aus dem Cache bedient,
+    bis ein SET-Befehl den Cache verwirft.
+    """
+    settings = {
+        "frequency_mhz": 868.35,
+        "bandwidth": 102.0,
+        "rampl": 30,
+        "sensitivity": 12,
+        "datarate": 4.8,
+    }
+    settings_mock = AsyncMock(return_value=settings)
+    signalduino_controller.commands.get_cc1101_settings = settings_mock
+    signalduino_controller.commands.set_rampl = AsyncMock()
+
+    dispatcher = MqttCommandDispatcher(controller=signalduino_controller)
+
+    async with signalduino_controller:
+        first = await dispatcher.dispatch("get/cc1101/settings", '{"req_id": "s1"}')
+        second = await dispatcher.dispatch("get/cc1101/settings", '{"req_id": "s2"}')
+
+        assert first['data'] == settings
+        assert second['data'] == settings
+        settings_mock.assert_called_once()
+
+        await dispatcher.dispatch("set/cc1101/rampl", '{"value": 30}')
+        await dispatcher.dispatch("get/cc1101/settings", '{"req_id": "s3"}')
+
+        assert settings_mock.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_cc1101_settings_does_not_cache_results_overtaken_by_set(signalduino_controller, mock_aiomqtt_client_cls):
+    """
+    Ein SET während eines laufenden Abrufs verhindert, dass dessen veraltetes
+    Ergebnis gecacht wird; zurückgegebene Werte sind Kopien des Cache-Eintrags.
+    """
+    release = asyncio.Event()
+
+    async def slow_settings(payload):
+        await release.wait()
+        return {"rampl": 24}
+
+    settings_mock = AsyncMock(side_effect=slow_settings)
+    signalduino_controller.commands.get_cc1101_settings = settings_mock
+    signalduino_controller.commands.set_rampl = AsyncMock()
+
+    async with signalduino_controller:
+        fetch = asyncio.create_task(signalduino_controller.get_cc1101_settings({}))
+        await asyncio.sleep(0)
+        await signalduino_controller.set_cc1101_rampl({"value": 30})
+        release.set()
+        assert await fetch == {"rampl": 24}
+
+        # Das überholte Ergebnis wurde nicht gecacht: der nächste Abruf fragt erneut
+        first = await signalduino_controller.get_cc1101_settings({})
+        assert settings_mock.call_count == 2
+
+        first["rampl"] = 99
+        second = await signalduino_controller.get_cc1101_settings({})
+        assert second == {"rampl": 24}
+        assert settings_mock.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_controller_handles_get_cc1101_register(signalduino_controller, mock_aiomqtt_client_cls, mock_logger):
     """
@@ -608,3 +674,67 @@ async def test_controller_handles_get_cc1101_register(signalduino_controller, mo
         expected_payload_dict = json.loads(mqtt_payload)
         read_reg_mock.assert_called_once_with(expected_payload_dict, timeout=SDUINO_CMD_TIMEOUT)
 
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_reuses_schema_validator():
+    """Der JSON-Schema-Validator wird pro Befehl nur einmal erzeugt und weiterverwendet."""
+    controller = MagicMock()
+    controller.set_cc1101_rampl = AsyncMock(return_value={"rampl": 30})
+    dispatcher = MqttCommandDispatcher(controller=controller)
+
+    await dispatcher.dispatch("set/cc1101/rampl", '{"value": 30}')
+    validator = dispatcher._validators["set/cc1101/rampl"]
+    await dispatcher.dispatch("set/cc1101/rampl", '{"value": 42}')
+    assert dispatcher._validators["set/cc1101/rampl"] is validator
+
+    with pytest.raises(CommandValidationError, match="Payload validation failed for set/cc1101/rampl"):
+        await dispatcher.dispatch("set/cc1101/rampl", '{"value": 31}')
+    assert controller.set_cc1101_rampl.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_numeric_responses_are_parsed():
+    """get_free_ram/get_uptime parse the decimal response and reject anything else."""
+    send_command = AsyncMock(side_effect=["1234\r", " 42 ", "OK"])
+    commands = SignalduinoCommands(send_command)
+
+    assert await commands.get_free_ram() == 1234
+    assert await commands.get_uptime() == 42
+    with pytest.raises(ValueError, match="Unexpected response format for Free RAM"):
+        await commands.get_free_ram()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("response", ["+5", "-5", "1_000", ""])
+async def test_numeric_responses_reject_signs_and_underscores(response):
+    """Nur reine Dezimalziffern gelten als Firmware-Zahl, nicht alles, was int() akzeptiert."""
+    commands = SignalduinoCommands(AsyncMock(return_value=response))
+
+    with pytest.raises(ValueError, match="Unexpected response format for Uptime"):
+        await commands.get_uptime()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("route, decoder_type, enabled", [
+    ("set/config/decoder_ms_enable", "S", True),
+    ("set/config/decoder_ms_disable", "S", False),
+    ("set/config/decoder_mu_enable", "U", True),
+    ("set/config/decoder_mu_disable", "U", False),
+    ("set/config/decoder_mc_enable", "C", True),
+    ("set/config/decoder_mc_disable", "C", False),
+])
+async def test_decoder_routes_share_one_handler(signalduino_controller, route, decoder_type, enabled):
+    """Die sechs Decoder-Routen landen in _set_decoder und liefern die neue Konfiguration."""
+    commands = signalduino_controller.commands
+    config = {"MS": 1, "MU": 1, "MC": 1}
+    with patch.object(commands, "set_decoder_enable", new=AsyncMock()) as mock_enable, \
+            patch.object(commands, "set_decoder_disable", new=AsyncMock()) as mock_disable, \
+            patch.object(commands, "get_config", new=AsyncMock(return_value=config)):
+        dispatcher = MqttCommandDispatcher(controller=signalduino_controller)
+        result = await dispatcher.dispatch(route, '{"req_id": "dec"}')
+
+    assert result["data"] == config
+    called, not_called = (mock_enable, mock_disable) if enabled else (mock_disable, mock_enable)
+    called.assert_awaited_once_with(decoder_type)
+    not_called.assert_not_awaited()
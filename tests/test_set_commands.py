@@ -44,6 +44,7 @@ async def test_set_message_type_enabled(controller, message_type, enabled, expec
         ("set_rampl", 24, "W1D00"),
         ("set_sens", 8, "W1F91"),
         ("set_patable", "C0", "xC0"),
+        ("set_deviation", 47.607422, "W1747"),
     ],
 )
 async def test_cc1101_commands(controller, method_name, value, expected_command_prefix):
@@ -151,3 +151,27 @@ async def test_readline_success(mock_open_connection):
         
         result = await transport.readline()
         assert result == 'test line'
+
+
+@pytest.mark.asyncio
+async def test_write_lines_single_write(mock_open_connection):
+    """Testet, dass write_lines mehrere Kommandos in einem einzigen write() überträgt."""
+    _, _, mock_writer = mock_open_connection
+    transport = TCPTransport("127.0.0.1", 8080)
+
+    async with transport:
+        mock_writer.write = MagicMock(wraps=mock_writer.write)
+        await transport.write_lines(["XQ", "V", "XE"])
+
+    mock_writer.write.assert_called_once_with(b"XQ\nV\nXE\n")
+
+
+@pytest.mark.asyncio
+async def test_readline_strips_crlf_and_keeps_latin1(mock_open_connection):
+    """Testet, dass CR/LF entfernt und Nicht-ASCII-Bytes latin-1-dekodiert werden."""
+    _, mock_reader, _ = mock_open_connection
+    transport = TCPTransport("127.0.0.1", 8080)
+    mock_reader.readline = AsyncMock(return_value=b'\x02MS;P0=1;D=01;\xb0\x03\r\n')
+
+    async with transport:
+        assert await transport.readline() == '\x02MS;P0=1;D=01;\xb0\x03'
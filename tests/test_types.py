@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+import pytest
+
+from signalduino.types import DecodedMessage, PendingResponse, QueuedCommand, RawFrame
+
+
+@pytest.mark.asyncio
+async def test_hot_path_records_have_no_instance_dict():
+    """Records created per command / per frame are slotted dataclasses."""
+    command = QueuedCommand(payload="V", timeout=1.0)
+    pending = PendingResponse(
+        command=command,
+        deadline=asyncio.get_running_loop().time() + command.timeout,
+        future=asyncio.get_running_loop().create_future(),
+    )
+    message = DecodedMessage(protocol_id="1", payload="ABC", raw=RawFrame(line="MS;"))
+
+    for record in (command, pending, message, message.raw):
+        assert not hasattr(record, "__dict__")
+    # Kommando-Daten werden nicht mehr in PendingResponse dupliziert
+    assert pending.command.payload == "V"
+    assert not hasattr(pending, "payload")
+    # Die Antwort wird allein über das Future signalisiert
+    assert not hasattr(pending, "event")
+
+
+def test_queued_command_uses_monotonic_timestamp():
+    """inserted_at shares the monotonic clock used by loop.time() deadlines."""
+    before = time.monotonic()
+    command = QueuedCommand(payload="V", timeout=1.0)
+    assert isinstance(command.inserted_at, float)
+    assert before <= command.inserted_at <= time.monotonic()